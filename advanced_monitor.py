@@ -1,83 +1,325 @@
 import requests
-import json
+import argparse
+import hashlib
+import orjson
 import logging
-import os
 import time
 import random
+import re
+import signal
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import urllib.parse
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
 from yad2_database import Yad2Database
-from yad2_notification_manager import send_property_notifications
+from yad2_parser import parse_property
+from yad2_notification_manager import send_property_notifications, get_email_recipients
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Optional: pysimdjson parses lazily, so only the feed subtree we index gets materialized
+try:
+    import simdjson
+    # A parser's document is invalidated by its next parse, so each thread gets its own
+    _simdjson_local = threading.local()
+    JSON_ARRAY_TYPES = (list, simdjson.Array)
+except ImportError:
+    simdjson = None
+    JSON_ARRAY_TYPES = (list,)
+
+# Working Next.js API endpoint
+API_URL = "https://www.yad2.co.il/realestate/_next/data/gtPYHLspEBp8Prnb6dWsk/rent.json"
+
+# Search parameters for Haifa rentals
+SEARCH_PARAMS = {
+    'maxPrice': '5000',
+    'minRooms': '2.5',
+    'maxRooms': '5',
+    'topArea': '25',
+    'area': '5'
+}
+
+# Realistic user agents (latest Chrome versions)
+USER_AGENTS = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/118.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:109.0) Gecko/20100101 Firefox/119.0'
+)
+
+# Realistic headers that match what a real browser sends (User-Agent added per set)
+BROWSER_HEADERS = {
+    'Accept': '*/*',
+    'Accept-Language': 'he-IL,he;q=0.9,en-US;q=0.8,en;q=0.7',
+    # Only advertise codings urllib3 can decode here (adds br/zstd when brotli/zstandard are installed)
+    'Accept-Encoding': ACCEPT_ENCODING,
+    'Referer': 'https://www.yad2.co.il/',
+    'Origin': 'https://www.yad2.co.il',
+    'Connection': 'keep-alive',
+    'Sec-Fetch-Dest': 'empty',
+    'Sec-Fetch-Mode': 'cors', 
+    'Sec-Fetch-Site': 'same-origin',
+    'sec-ch-ua': '"Google Chrome";v="119", "Chromium";v="119", "Not?A_Brand";v="24"',
+    'sec-ch-ua-mobile': '?0',
+    'sec-ch-ua-platform': '"Windows"',
+    'DNT': '1'
+}
+
+# Extra headers for the Next.js data request
+NEXTJS_API_HEADERS = {
+    'Accept': 'application/json',
+    'x-nextjs-data': '1',
+    'Referer': 'https://www.yad2.co.il/realestate/rent',
+    'Cache-Control': 'no-cache',
+    'Pragma': 'no-cache'
+}
+
+# (browser headers, API headers) per user agent, built once at import
+BROWSER_HEADER_SETS = tuple(
+    ({'User-Agent': ua, **BROWSER_HEADERS}, {'User-Agent': ua, **BROWSER_HEADERS, **NEXTJS_API_HEADERS})
+    for ua in USER_AGENTS
+)
+
+# Page visits only log the status code, so their bodies are sent uncompressed
+# and never decoded (still read, so the connection goes back to the pool)
+PAGE_VISIT_HEADERS = {'Accept-Encoding': 'identity'}
+
+# Markers of a bot-protection page, scanned over the raw response bytes
+CAPTCHA_PATTERN = re.compile(rb'shieldsquare|captcha|blocked|perimeterx|akamai.botmanager', re.IGNORECASE)
+
+# Process-wide DNS cache so repeated requests to yad2.co.il skip the resolver
+DNS_CACHE_TTL = 300
+_dns_cache = {}
+_original_getaddrinfo = socket.getaddrinfo
+
+def _cached_getaddrinfo(host, port, family=0, type=0, proto=0, flags=0):
+    """socket.getaddrinfo replacement that memoizes results for DNS_CACHE_TTL seconds"""
+    key = (host, port, family, type, proto, flags)
+    cached = _dns_cache.get(key)
+    now = time.monotonic()
+    if cached and now - cached[0] < DNS_CACHE_TTL:
+        logger.debug("🌐 DNS cache hit: %s:%s", host, port)
+        return cached[1]
+    result = _original_getaddrinfo(host, port, family, type, proto, flags)
+    _dns_cache[key] = (now, result)
+    return result
+
+def install_dns_cache():
+    """Route all name resolution in this process through the DNS cache"""
+    socket.getaddrinfo = _cached_getaddrinfo
+
+# (connect, read) timeouts - fail fast on dead connections, allow slow bodies
+PAGE_TIMEOUT = (5, 10)
+API_TIMEOUT = (5, 30)
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Statuses the session retries with backoff before handing the last response to the caller
+RETRY_STATUSES = (429, 502, 503, 504)
+
+# Longest Retry-After the session's retries will wait; longer rate limits are left to the next cycle
+MAX_RETRY_AFTER = 10
+
+# Stale properties are marked inactive at most this often
+CLEANUP_INTERVAL = 60 * 60
+
+# Meta key holding the ids of the last stored feed, refreshed when the feed comes back unchanged
+FEED_IDS_META_KEY = 'feed_property_ids'
+
+# Warm cookies are trusted this long before the warmup page visits run again
+WARM_SESSION_TTL = 30 * 60
+
+# Seconds of random jitter around the continuous-monitoring interval
+INTERVAL_JITTER = 30
+
+def read_response_body(response):
+    """Read a streamed response into one buffer without keeping the individual chunks alive"""
+    body = bytearray()
+    for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+        body.extend(chunk)
+    # Parsers want immutable bytes; converting here means only one copy stays alive
+    return bytes(body)
+
+def parse_json_response(content):
+    """Parse an API response body, lazily with simdjson when it is installed"""
+    if simdjson is not None:
+        parser = getattr(_simdjson_local, 'parser', None)
+        if parser is None:
+            parser = _simdjson_local.parser = simdjson.Parser()
+        return parser.parse(content)
+    return orjson.loads(content)
+
+def as_plain_listing(item):
+    """Copy a lazy simdjson listing into a plain dict (no-op for orjson output)"""
+    return item if isinstance(item, dict) else item.as_dict()
+
+def get_feed(data):
+    """The payload's pageProps.feed object, or None when it has no feed"""
+    # Two subscripts on the happy path instead of two membership tests plus two subscripts
+    try:
+        return data['pageProps']['feed']
+    except (KeyError, TypeError):
+        return None
+
+# Feed types in the Next.js payload; private listings are the main property feed
+FEED_TYPES = ('private', 'business', 'promoted')
+
+def collect_feed_listings(feed):
+    """Plain listings from every feed type, skipping ones already seen under an earlier type"""
+    listings = []
+    seen_ids = set()
+    # Bound once; the loop below runs per listing
+    append, mark_seen = listings.append, seen_ids.add
+    
+    for feed_type in FEED_TYPES:
+        items = feed[feed_type] if feed_type in feed else None
+        if isinstance(items, JSON_ARRAY_TYPES):
+            logger.info("📊 Found %d %s listings", len(items), feed_type)
+            
+            for item in items:
+                # Same id rule as parse_property; promoted listings often repeat private ones
+                listing_id = item['token'] if 'token' in item else item.get('orderId')
+                if listing_id:
+                    if listing_id in seen_ids:
+                        continue
+                    mark_seen(listing_id)
+                append(as_plain_listing(item))
+    
+    return listings
+
+def parse_listings(listings):
+    """Parse listings in order. Serial on purpose: a feed is a few hundred small dicts, and forking
+    worker processes while the cleanup and notification threads hold locks can deadlock them"""
+    return list(map(parse_property, listings))
+
+class KeepAliveAdapter(HTTPAdapter):
+    """HTTPAdapter whose sockets enable TCP keepalive, so pooled connections left idle
+    between cycles are kept open through NATs/firewalls instead of silently going dead"""
+    
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['socket_options'] = HTTPConnection.default_socket_options + [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+        super().init_poolmanager(*args, **kwargs)
+
+class CappedRetry(Retry):
+    """Retry that waits at most MAX_RETRY_AFTER seconds for a Retry-After header, so a long
+    rate limit can't stall a cycle (or the populator's page workers) on every retry"""
+    
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        return None if retry_after is None else min(retry_after, MAX_RETRY_AFTER)
+
 class AdvancedYad2Monitor:
     """
     Advanced Yad2 monitor with sophisticated anti-detection techniques
     """
     
+    # Shared across instances so connections survive between monitoring cycles
+    _session = None
+    
+    # When a fetch first proved the shared session's cookies good (None = not warm)
+    _warm_since = None
+    
     def __init__(self):
         self.db = Yad2Database()
         
-        # Working Next.js API endpoint
-        self.api_url = "https://www.yad2.co.il/realestate/_next/data/gtPYHLspEBp8Prnb6dWsk/rent.json"
-        
-        # Search parameters for Haifa rentals
-        self.params = {
-            'maxPrice': '5000',
-            'minRooms': '2.5',
-            'maxRooms': '5',
-            'topArea': '25',
-            'area': '5'
-        }
+        self.api_url = API_URL
+        self.params = SEARCH_PARAMS
         
         # Email recipients from environment variables
-        self.email_recipients = [
-            os.getenv('EMAIL_RECIPIENT_1'),
-            os.getenv('EMAIL_RECIPIENT_2')
-        ]
-        # Filter out None values
-        self.email_recipients = [email for email in self.email_recipients if email]
+        self.email_recipients = list(get_email_recipients())
         
-        # Create session with advanced settings
-        self.session = requests.Session()
+        # Cache DNS lookups before any connection is opened
+        install_dns_cache()
+        
+        # Reuse the process-wide session and refresh its anti-detection settings
+        self.session = self.get_session()
         self.setup_advanced_session()
+        
+        # Set to end run_forever; its sleep between cycles wakes up immediately
+        self._stop = threading.Event()
+        
+        # Emails go out on one background worker so SMTP never delays the next fetch
+        self._notify_pool = ThreadPoolExecutor(max_workers=1)
     
-    def setup_advanced_session(self):
-        """Setup session with advanced anti-detection measures"""
+    @classmethod
+    def get_session(cls):
+        """Return the long-lived session shared by all monitors, creating it on first use"""
+        if AdvancedYad2Monitor._session is None:
+            session = requests.Session()
+            
+            # Pooled keep-alive connections so the page visits and API call share one TLS connection
+            # pool_maxsize leaves room for the populator's concurrent page fetches;
+            # 429/5xx on a GET is retried with backoff (honouring a capped Retry-After) instead of losing the page;
+            # once retries run out the last response is returned, so callers' status handling still sees it
+            adapter = KeepAliveAdapter(
+                pool_connections=4,
+                pool_maxsize=16,
+                max_retries=CappedRetry(
+                    total=3,
+                    backoff_factor=1.5,
+                    status_forcelist=RETRY_STATUSES,
+                    allowed_methods=frozenset(['GET']),
+                    raise_on_status=False
+                )
+            )
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            AdvancedYad2Monitor._session = session
         
-        # Realistic user agents (latest Chrome versions)
-        user_agents = [
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/118.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:109.0) Gecko/20100101 Firefox/119.0'
-        ]
+        return AdvancedYad2Monitor._session
+    
+    @classmethod
+    def session_is_warm(cls):
+        """Whether the shared session's cookies are recent enough to skip the warmup page visits"""
+        warm_since = AdvancedYad2Monitor._warm_since
+        if warm_since is not None and time.monotonic() - warm_since > WARM_SESSION_TTL:
+            AdvancedYad2Monitor._warm_since = warm_since = None
+        return warm_since is not None
+    
+    @classmethod
+    def mark_session_warm(cls, warm=True):
+        """Record a fetch that proved the shared session good, or one that got challenged"""
+        if not warm:
+            AdvancedYad2Monitor._warm_since = None
+        elif AdvancedYad2Monitor._warm_since is None:
+            AdvancedYad2Monitor._warm_since = time.monotonic()
+    
+    def restore_session_state(self):
+        """Load cookies saved by an earlier process; still-warm ones let this run skip the warmup"""
+        state = self.db.get_meta('session_state')
+        state = orjson.loads(state) if state else None
+        if not state:
+            return False
         
-        selected_ua = random.choice(user_agents)
+        age = time.time() - state['warm_since']
+        if age >= WARM_SESSION_TTL:
+            return False
         
-        # Build realistic headers that match what a real browser sends
-        headers = {
-            'User-Agent': selected_ua,
-            'Accept': '*/*',
-            'Accept-Language': 'he-IL,he;q=0.9,en-US;q=0.8,en;q=0.7',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Referer': 'https://www.yad2.co.il/',
-            'Origin': 'https://www.yad2.co.il',
-            'Connection': 'keep-alive',
-            'Sec-Fetch-Dest': 'empty',
-            'Sec-Fetch-Mode': 'cors', 
-            'Sec-Fetch-Site': 'same-origin',
-            'sec-ch-ua': '"Google Chrome";v="119", "Chromium";v="119", "Not?A_Brand";v="24"',
-            'sec-ch-ua-mobile': '?0',
-            'sec-ch-ua-platform': '"Windows"',
-            'DNT': '1',
-            'Cache-Control': 'no-cache',
-            'Pragma': 'no-cache'
-        }
+        self.session.cookies.update(state['cookies'])
+        AdvancedYad2Monitor._warm_since = time.monotonic() - age
+        logger.info("🍪 Restored session cookies (%.0fs old)", age)
+        return True
+    
+    def save_session_state(self):
+        """Persist the session cookies while they are warm so the next process can reuse them"""
+        state = None
+        if self.session_is_warm():
+            warm_for = time.monotonic() - AdvancedYad2Monitor._warm_since
+            state = {'cookies': self.session.cookies.get_dict(), 'warm_since': time.time() - warm_for}
+        self.db.set_meta('session_state', orjson.dumps(state).decode())
+    
+    def setup_advanced_session(self):
+        """Setup session with advanced anti-detection measures"""
         
+        # Pick one of the precomputed browser header sets
+        headers, self.api_headers = random.choice(BROWSER_HEADER_SETS)
         self.session.headers.update(headers)
         
         # Add common cookies that browsers have
@@ -89,32 +331,37 @@ class AdvancedYad2Monitor:
     def simulate_human_browsing(self):
         """Simulate human browsing patterns before making the API call"""
         try:
-            logger.info("🤖 Simulating human browsing behavior...")
-            
-            # Step 1: Visit main page first
-            main_page_delay = random.uniform(1, 3)
-            time.sleep(main_page_delay)
+            # Cookies from a previous cycle are still valid, and run_forever already
+            # jitters the cycle start, so there is nothing left to simulate
+            if self.session_is_warm():
+                logger.info("⏩ Session already warm - skipping browsing simulation")
+                return True
             
-            main_response = self.session.get(
-                'https://www.yad2.co.il/',
-                timeout=10
-            )
-            logger.info(f"📄 Visited main page: {main_response.status_code}")
+            logger.info("🤖 Simulating human browsing behavior...")
             
-            # Step 2: Visit real estate section
-            realestate_delay = random.uniform(2, 5)
-            time.sleep(realestate_delay)
+            # Steps 1+2: Visit main page and real estate section with overlapped requests,
+            # staggering the second one slightly so the traffic still looks human
+            def visit_realestate_section():
+                time.sleep(random.uniform(1, 2))
+                requested_at = time.monotonic()
+                return requested_at, self.session.get('https://www.yad2.co.il/realestate/rent', headers=PAGE_VISIT_HEADERS, timeout=PAGE_TIMEOUT)
             
-            realestate_response = self.session.get(
-                'https://www.yad2.co.il/realestate/rent',
-                timeout=10
-            )
-            logger.info(f"🏠 Visited realestate section: {realestate_response.status_code}")
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                main_future = executor.submit(self.session.get, 'https://www.yad2.co.il/', headers=PAGE_VISIT_HEADERS, timeout=PAGE_TIMEOUT)
+                realestate_future = executor.submit(visit_realestate_section)
+                
+                main_response = main_future.result()
+                logger.info("📄 Visited main page: %s", main_response.status_code)
+                
+                realestate_requested_at, realestate_response = realestate_future.result()
+                logger.info("🏠 Visited realestate section: %s", realestate_response.status_code)
             
-            # Step 3: Random delay before API call
+            # Step 3: Random "time on page" before the API call, counted from when the
+            # page was requested so its load time isn't waited for twice
             api_delay = random.uniform(3, 8)
-            logger.info(f"⏳ Final delay before API call: {api_delay:.1f}s")
-            time.sleep(api_delay)
+            remaining_delay = max(0, api_delay - (time.monotonic() - realestate_requested_at))
+            logger.info("⏳ Final delay before API call: %.1fs (of %.1fs on page)", remaining_delay, api_delay)
+            time.sleep(remaining_delay)
             
             return True
             
@@ -124,63 +371,115 @@ class AdvancedYad2Monitor:
             return False
     
     def fetch_properties_with_stealth(self):
-        """Fetch properties using stealth techniques"""
+        """Fetch properties using stealth techniques. Returns (properties, feed_meta): properties is None
+        if the feed is unchanged (304), and feed_meta holds the cache validators to store once the
+        properties have been saved"""
         try:
             # Step 1: Simulate human browsing
             self.simulate_human_browsing()
             
-            # Step 2: Update headers to match Next.js request
-            api_headers = self.session.headers.copy()
-            api_headers.update({
-                'Accept': 'application/json',
-                'x-nextjs-data': '1',
-                'Referer': 'https://www.yad2.co.il/realestate/rent'
-            })
-            
             logger.info("🔍 Making stealth API request...")
             
-            # Step 3: Make the actual API request
-            response = self.session.get(
+            # Step 2: Make the actual API request with the precomputed Next.js headers,
+            # conditional on the feed having changed since the last successful fetch
+            headers = self.api_headers
+            etag = self.db.get_meta('feed_etag')
+            last_modified = self.db.get_meta('feed_last_modified')
+            if etag or last_modified:
+                headers = dict(headers)
+                if etag:
+                    headers['If-None-Match'] = etag
+                if last_modified:
+                    headers['If-Modified-Since'] = last_modified
+            
+            with self.session.get(
                 self.api_url,
                 params=self.params,
-                headers=api_headers,
-                timeout=30
-            )
-            
-            logger.info(f"📡 Response status: {response.status_code}")
-            logger.info(f"📄 Content-Type: {response.headers.get('content-type', 'unknown')}")
-            
-            # Check response
-            if response.status_code != 200:
-                logger.error(f"❌ HTTP error {response.status_code}")
-                return []
-            
-            # Check for CAPTCHA
-            content_preview = response.text[:500].lower()
-            if any(keyword in content_preview for keyword in ['shieldsquare', 'captcha', 'blocked']):
-                logger.warning("🛡️ CAPTCHA detected despite stealth measures")
-                return []
-            
-            # Try to parse JSON
+                headers=headers,
+                timeout=API_TIMEOUT,
+                stream=True
+            ) as response:
+                logger.info("📡 Response status: %s", response.status_code)
+                logger.info("📄 Content-Type: %s", response.headers.get('content-type', 'unknown'))
+                
+                # Unchanged feed - nothing to parse, store or notify
+                if response.status_code == 304:
+                    logger.info("✅ Feed unchanged (304)")
+                    return None, {}
+                
+                # Check response - blocks, rate limits and server errors each need different handling
+                status = response.status_code
+                if status in (403, 429):
+                    # The bot protection flagged these cookies; warm up again next cycle
+                    logger.warning("🛡️ Request blocked (HTTP %d)", status)
+                    self.mark_session_warm(False)
+                    return [], {}
+                if status >= 500:
+                    logger.error("❌ Server error %d%s, will try again next cycle",
+                                 status, " (retries exhausted)" if status in RETRY_STATUSES else "")
+                    return [], {}
+                if status != 200:
+                    logger.error("❌ HTTP error %d", status)
+                    return [], {}
+                
+                etag = response.headers.get('ETag')
+                last_modified = response.headers.get('Last-Modified')
+                body = read_response_body(response)
+            
+            # Validate the body through a zero-copy view
+            body_view = memoryview(body)
+            if not body_view:
+                logger.error("❌ Empty response body")
+                return [], {}
+            
+            # Fingerprint the bytes as received, for change detection when the server sends no ETag
+            body_digest = hashlib.blake2b(body_view, digest_size=8).hexdigest()
+            logger.debug("🔑 Response body: %d bytes, digest %s", len(body_view), body_digest)
+            
+            # Byte-identical to the last processed feed (servers without ETag support) - same as a 304
+            if body_digest == self.db.get_meta('feed_digest'):
+                logger.info("✅ Feed unchanged (same digest)")
+                return None, {}
+            
+            # Try to parse JSON - the happy path never scans the body for CAPTCHA markers
             try:
-                data = response.json()
-                logger.info("✅ Successfully parsed JSON response!")
-                return self.extract_properties_from_response(data)
+                data = parse_json_response(body)
+            except ValueError as e:  # json, orjson and simdjson decode errors
+                # Not JSON - check whether we got a CAPTCHA page instead (one pass over the whole body)
+                if CAPTCHA_PATTERN.search(body_view):
+                    logger.warning("🛡️ CAPTCHA detected despite stealth measures")
+                    self.mark_session_warm(False)
+                    return [], {}
                 
-            except json.JSONDecodeError as e:
                 logger.error(f"❌ JSON parsing error: {e}")
-                logger.error(f"Response preview: {response.text[:200]}")
-                return []
+                logger.error(f"Response preview: {bytes(body_view[:200]).decode('utf-8', 'replace')}")
+                return [], {}
+            
+            logger.info("✅ Successfully parsed JSON response!")
+            properties = self.extract_properties_from_response(data)
+            self.mark_session_warm(bool(properties))
+            
+            # The validators and digest are only stored by the caller once these properties are in the
+            # database, otherwise a failed write would make every later fetch look unchanged for listings
+            # that were never saved
+            feed_meta = {}
+            if properties:
+                if etag:
+                    feed_meta['feed_etag'] = etag
+                if last_modified:
+                    feed_meta['feed_last_modified'] = last_modified
+                feed_meta['feed_digest'] = body_digest
+            return properties, feed_meta
             
         except requests.exceptions.Timeout:
             logger.error("⏰ Request timeout")
-            return []
+            return [], {}
         except requests.exceptions.RequestException as e:
             logger.error(f"🌐 Network error: {e}")
-            return []
+            return [], {}
         except Exception as e:
             logger.error(f"❌ Unexpected error: {e}")
-            return []
+            return [], {}
     
     def extract_properties_from_response(self, data):
         """Extract properties from the API response"""
@@ -188,29 +487,13 @@ class AdvancedYad2Monitor:
         
         try:
             # The actual structure is pageProps.feed.private for property listings
-            if 'pageProps' in data and 'feed' in data['pageProps']:
-                feed = data['pageProps']['feed']
-                
-                # Check for private listings (main property feed)
-                if 'private' in feed:
-                    private_listings = feed['private']
-                    logger.info(f"📊 Found {len(private_listings)} private listings")
-                    
-                    for item in private_listings:
-                        prop = self.parse_property_new_structure(item)
-                        if prop:
-                            properties.append(prop)
+            feed = get_feed(data)
+            if feed is not None:
+                # Each listing is parsed and stored once, even if it appears in several feed types
+                listings = collect_feed_listings(feed)
+                properties = [prop for prop in parse_listings(listings) if prop]
                 
-                # Also check for other feed types if they exist
-                for feed_type in ['business', 'promoted']:
-                    if feed_type in feed and isinstance(feed[feed_type], list):
-                        logger.info(f"📊 Found {len(feed[feed_type])} {feed_type} listings")
-                        for item in feed[feed_type]:
-                            prop = self.parse_property_new_structure(item)
-                            if prop:
-                                properties.append(prop)
-                
-                logger.info(f"🏠 Successfully extracted {len(properties)} total properties")
+                logger.info("🏠 Successfully extracted %d total properties", len(properties))
             else:
                 logger.warning("⚠️ No feed data found in response")
                 
@@ -221,119 +504,18 @@ class AdvancedYad2Monitor:
     
     def parse_property_new_structure(self, item):
         """Parse a single property from the new API response structure"""
-        try:
-            # Extract basic property info - using token as ID since it's more unique
-            property_data = {
-                'id': str(item.get('token', item.get('orderId', ''))),
-                'title': '',
-                'price': 0,
-                'rooms': 0,
-                'floor': 0,
-                'size': 0,
-                'images': [],
-                'description': '',
-                'contact_name': '',
-                'phone': '',
-                'address': '',
-                'neighborhood': '',
-                'amenities': []
-            }
-            
-            # Extract price
-            if 'price' in item:
-                try:
-                    property_data['price'] = int(item['price'])
-                except:
-                    property_data['price'] = 0
-            
-            # Extract rooms from additionalDetails
-            if 'additionalDetails' in item:
-                details = item['additionalDetails']
-                if 'roomsCount' in details:
-                    try:
-                        property_data['rooms'] = float(details['roomsCount'])
-                    except:
-                        property_data['rooms'] = 0
-                
-                # Extract size
-                if 'squareMeter' in details:
-                    try:
-                        property_data['size'] = int(details['squareMeter'])
-                    except:
-                        property_data['size'] = 0
-            
-            # Extract floor from address
-            if 'address' in item and 'house' in item['address'] and 'floor' in item['address']['house']:
-                try:
-                    property_data['floor'] = int(item['address']['house']['floor'])
-                except:
-                    property_data['floor'] = 0
-            
-            # Extract address information
-            if 'address' in item:
-                addr = item['address']
-                address_parts = []
-                
-                if 'street' in addr and 'text' in addr['street']:
-                    street = addr['street']['text']
-                    if 'house' in addr and 'number' in addr['house']:
-                        street += f" {addr['house']['number']}"
-                    address_parts.append(street)
-                
-                if 'neighborhood' in addr and 'text' in addr['neighborhood']:
-                    property_data['neighborhood'] = addr['neighborhood']['text']
-                    address_parts.append(property_data['neighborhood'])
-                
-                if 'city' in addr and 'text' in addr['city']:
-                    address_parts.append(addr['city']['text'])
-                
-                property_data['address'] = ', '.join(address_parts)
-            
-            # Extract images from metaData
-            if 'metaData' in item and 'images' in item['metaData']:
-                property_data['images'] = item['metaData']['images']
-            
-            # Extract amenities from tags
-            if 'tags' in item:
-                property_data['amenities'] = [tag.get('name', '') for tag in item['tags'] if tag.get('name')]
-            
-            # Build title
-            room_text = f"{property_data['rooms']} חדרים" if property_data['rooms'] > 0 else ""
-            location_text = property_data['neighborhood'] or 'חיפה'
-            property_type = ""
-            
-            if 'additionalDetails' in item and 'property' in item['additionalDetails'] and 'text' in item['additionalDetails']['property']:
-                property_type = item['additionalDetails']['property']['text']
-            
-            title_parts = []
-            if room_text:
-                title_parts.append(room_text)
-            if property_type:
-                title_parts.append(property_type)
-            if location_text:
-                title_parts.append(f"ב{location_text}")
-            
-            property_data['title'] = ' '.join(title_parts) or f"נכס ב{location_text}"
-            
-            # Extract description from various sources
-            description_parts = []
-            if property_type and property_type not in property_data['title']:
-                description_parts.append(property_type)
-            if property_data['amenities']:
-                description_parts.extend(property_data['amenities'][:3])  # First 3 amenities
-            property_data['description'] = ', '.join(description_parts)
-            
-            # Only return properties with essential data
-            if property_data['id'] and property_data['price'] > 0 and property_data['address']:
-                logger.info(f"✨ Parsed: {property_data['title']} - ₪{property_data['price']:,}")
-                return property_data
-            else:
-                logger.debug(f"⚠️ Skipping property with missing data: ID={property_data['id']}, Price={property_data['price']}, Address={property_data['address']}")
-                return None
-                
-        except Exception as e:
-            logger.error(f"❌ Error parsing property: {e}")
-            return None
+        return parse_property(item)
+    
+    def cleanup_if_due(self):
+        """Mark properties unseen for 14 days inactive, at most once per CLEANUP_INTERVAL
+        (tracked in the database, so scheduled one-shot runs share the cadence)"""
+        last_cleanup = self.db.get_meta('last_cleanup')
+        now = time.time()
+        if last_cleanup and now - float(last_cleanup) < CLEANUP_INTERVAL:
+            return
+        
+        self.db.cleanup_old_properties(days=14)
+        self.db.set_meta('last_cleanup', str(now))
     
     def run_monitoring_cycle(self):
         """Run monitoring cycle with advanced techniques"""
@@ -341,46 +523,57 @@ class AdvancedYad2Monitor:
         start_time = datetime.now()
         
         try:
-            # Clean up old properties
-            self.db.cleanup_old_properties(days=14)
+            # Clean up old properties in the background while the network fetch runs
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                cleanup_future = executor.submit(self.cleanup_if_due)
+                
+                # Fetch properties with stealth
+                properties, feed_meta = self.fetch_properties_with_stealth()
+                
+                # Cleanup must finish before this cycle's writes
+                cleanup_future.result()
             
-            # Fetch properties with stealth
-            properties = self.fetch_properties_with_stealth()
+            if properties is None:
+                # The listings are still up, so keep them from aging into the stale cleanup
+                self.db.refresh_last_seen(FEED_IDS_META_KEY)
+                logger.info("📭 No changes since last cycle - nothing to process")
+                return
             
             if not properties:
                 logger.warning("❌ No properties fetched - cycle aborted")
                 return
             
-            # Process properties
-            new_count = 0
-            price_change_count = 0
+            # Process properties - the upsert returns exactly this cycle's new and changed rows
+            result = self.db.add_or_update_properties(properties, batch_key=FEED_IDS_META_KEY)
+            if result is None:
+                logger.error("❌ Could not save properties - will fetch the full feed again next cycle")
+                return
+            new_rows, price_change_rows = result
             
-            for prop in properties:
-                is_new, price_changed = self.db.add_or_update_property(prop)
-                
-                if is_new:
-                    new_count += 1
-                    logger.info(f"✨ New: {prop['title']} - ₪{prop['price']:,}")
-                
-                if price_changed:
-                    price_change_count += 1
-                    logger.info(f"💰 Price change: {prop['title']} - ₪{prop['price']:,}")
+            # The feed is stored, so the next fetch may be conditional on it
+            for key, value in feed_meta.items():
+                self.db.set_meta(key, value)
+            new_count = len(new_rows)
+            price_change_count = len(price_change_rows)
+            
+            if logger.isEnabledFor(logging.DEBUG):
+                for row in new_rows:
+                    logger.debug(f"✨ New: {row['title']} - ₪{row['price']:,}")
+                for row in price_change_rows:
+                    logger.debug(f"💰 Price change: {row['title']} - ₪{row['price']:,}")
             
             # Send notifications
             total_changes = new_count + price_change_count
             if total_changes > 0:
-                logger.info(f"📧 Sending notifications: {new_count} new + {price_change_count} changes")
+                logger.info("📧 Sending notifications: %d new + %d changes", new_count, price_change_count)
                 
-                try:
-                    send_property_notifications(
-                        new_properties=self.db.get_new_properties(hours=1),
-                        price_changes=self.db.get_price_changes(hours=1),
-                        recipients=self.email_recipients
-                    )
-                    logger.info("✅ Email notifications sent successfully")
-                    
-                except Exception as e:
-                    logger.error(f"❌ Email error: {e}")
+                notify_future = self._notify_pool.submit(
+                    send_property_notifications,
+                    new_properties=new_rows,
+                    price_changes=price_change_rows,
+                    recipients=self.email_recipients
+                )
+                notify_future.add_done_callback(self._log_notify_result)
             else:
                 logger.info("📧 No changes - no notifications sent")
             
@@ -389,18 +582,72 @@ class AdvancedYad2Monitor:
             end_time = datetime.now()
             duration = (end_time - start_time).total_seconds()
             
-            logger.info(f"✅ Cycle completed in {duration:.1f}s")
-            logger.info(f"📊 Processed: {len(properties)} properties")
-            logger.info(f"📊 Database: {stats['active']} active properties, {stats['total']} total")
+            logger.info("✅ Cycle completed in %.1fs", duration)
+            logger.info("📊 Processed: %d properties", len(properties))
+            logger.info("📊 Database: %d active properties, %d total", stats['active'], stats['total'])
             
         except Exception as e:
             logger.error(f"❌ Cycle error: {e}")
             raise
 
+    @staticmethod
+    def _log_notify_result(future):
+        """Log the outcome of a background notification send"""
+        e = future.exception()
+        if e:
+            logger.error(f"❌ Email error: {e}")
+        else:
+            logger.info("✅ Email notifications sent successfully")
+    
+    def close(self):
+        """Wait for queued notifications to finish sending, then close the database connection"""
+        self._notify_pool.shutdown(wait=True)
+        self.db.close()
+    
+    def run_forever(self, interval_s=600):
+        """Run monitoring cycles until interrupted, keeping the session and cookies warm between them"""
+        logger.info(f"🔁 Starting continuous monitoring every ~{interval_s}s")
+        # The interval is fixed for the whole run, so resolve its jitter bounds once
+        min_interval, max_interval = interval_s - INTERVAL_JITTER, interval_s + INTERVAL_JITTER
+        
+        while not self._stop.is_set():
+            cycle_start = time.monotonic()
+            
+            try:
+                self.run_monitoring_cycle()
+            except Exception as e:
+                logger.error(f"❌ Cycle failed, will retry next interval: {e}")
+            
+            # Sleep until the next cycle should start, with jitter so polls don't look scheduled
+            elapsed = time.monotonic() - cycle_start
+            sleep_s = max(0, random.uniform(min_interval, max_interval) - elapsed)
+            logger.info("😴 Next cycle in %.0fs", sleep_s)
+            if self._stop.wait(sleep_s):
+                break
+        
+        self.close()
+        logger.info("🛑 Continuous monitoring stopped")
+    
+    def stop(self, *_):
+        """Make run_forever return after the current cycle (usable as a signal handler)"""
+        self._stop.set()
+
 def main():
     """Main entry point"""
+    parser = argparse.ArgumentParser(description="Advanced Yad2 Haifa property monitor")
+    parser.add_argument('--one-shot', action='store_true', help="run a single cycle and exit")
+    parser.add_argument('--interval', type=int, default=600, help="seconds between cycles (default: 600)")
+    args = parser.parse_args()
+    
     monitor = AdvancedYad2Monitor()
-    monitor.run_monitoring_cycle()
+    if args.one_shot:
+        monitor.run_monitoring_cycle()
+        monitor.close()
+    else:
+        # Stop cleanly between cycles instead of dying mid-write
+        signal.signal(signal.SIGINT, monitor.stop)
+        signal.signal(signal.SIGTERM, monitor.stop)
+        monitor.run_forever(args.interval)
 
 if __name__ == "__main__":
     main()
@@ -7,6 +7,27 @@ import os
 import shutil
 from advanced_monitor import AdvancedYad2Monitor
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# Linux ioctl that makes dst share src's blocks copy-on-write (btrfs, xfs, ...)
+FICLONE = 0x40049409
+
+def clone_database_file(source, destination):
+    """Copy a database file, using a copy-on-write reflink where the filesystem supports it"""
+    if fcntl is not None:
+        try:
+            with open(source, 'rb') as src, open(destination, 'wb') as dst:
+                fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            return
+        except OSError:
+            pass
+    
+    # Falls back to a kernel-side copy (sendfile) on Linux
+    shutil.copyfile(source, destination)
+
 class GitHubAdvancedYad2Monitor(AdvancedYad2Monitor):
     """
     GitHub Actions optimized version with database persistence
@@ -25,7 +46,7 @@ class GitHubAdvancedYad2Monitor(AdvancedYad2Monitor):
         # If no local database exists but GitHub baseline does, use it
         if not os.path.exists(local_db) and os.path.exists(github_baseline):
             print(f"🔄 Initializing from GitHub baseline database...")
-            shutil.copy2(github_baseline, local_db)
+            clone_database_file(github_baseline, local_db)
             print(f"✅ Database initialized with baseline data")
         elif os.path.exists(local_db):
             print(f"📊 Using existing local database")
@@ -40,6 +61,7 @@ def main():
         
         monitor = GitHubAdvancedYad2Monitor()
         monitor.run_monitoring_cycle()
+        monitor.close()
         
         print("✅ GitHub monitoring cycle completed successfully")
         
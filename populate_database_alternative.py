@@ -5,14 +5,22 @@ to get a variety of properties and populate the database
 """
 
 import requests
-import json
+import orjson
 import logging
 import os
 import time
 import random
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from urllib.parse import urlencode
 from dotenv import load_dotenv
+from advanced_monitor import (
+    AdvancedYad2Monitor, PAGE_VISIT_HEADERS, RETRY_STATUSES, collect_feed_listings, get_feed, parse_json_response
+)
 from yad2_database import Yad2Database
+from yad2_parser import parse_property
 
 # Load environment variables
 load_dotenv()
@@ -21,6 +29,106 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Optional: httpx over HTTP/2 multiplexes the concurrent page fetches on one TLS connection
+try:
+    import httpx
+    import h2  # required by httpx for http2=True
+    TIMEOUT_ERRORS = (requests.exceptions.Timeout, httpx.TimeoutException)
+    NETWORK_ERRORS = (requests.exceptions.RequestException, httpx.HTTPError)
+except ImportError:
+    httpx = None
+    TIMEOUT_ERRORS = (requests.exceptions.Timeout,)
+    NETWORK_ERRORS = (requests.exceptions.RequestException,)
+
+# Pages fetched concurrently per batch. The rate limiter hands out one request at a time, so this only
+# overlaps waiting on responses and never adds to the request rate
+PAGE_FETCH_WORKERS = 4
+
+# Bot-protection markers checked in the start of each page body (raw bytes, one pass)
+CAPTCHA_PREVIEW_PATTERN = re.compile(rb'shieldsquare|captcha|blocked|bot|verification', re.IGNORECASE)
+
+# Listings per results page, for feeds that report an item total instead of a page count
+FEED_PAGE_SIZE = 20
+
+# Realistic user agents (latest Chrome versions), one picked per populator session
+POPULATOR_USER_AGENTS = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/118.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:109.0) Gecko/20100101 Firefox/119.0'
+)
+
+# Realistic headers that match what a real browser sends (User-Agent added per session)
+POPULATOR_SESSION_HEADERS = {
+    'Accept': '*/*',
+    'Accept-Language': 'he-IL,he;q=0.9,en-US;q=0.8,en;q=0.7',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'Referer': 'https://www.yad2.co.il/',
+    'Origin': 'https://www.yad2.co.il',
+    'Connection': 'keep-alive',
+    'Sec-Fetch-Dest': 'empty',
+    'Sec-Fetch-Mode': 'cors', 
+    'Sec-Fetch-Site': 'same-origin',
+    'sec-ch-ua': '"Google Chrome";v="119", "Chromium";v="119", "Not?A_Brand";v="24"',
+    'sec-ch-ua-mobile': '?0',
+    'sec-ch-ua-platform': '"Windows"',
+    'DNT': '1',
+    'Cache-Control': 'no-cache',
+    'Pragma': 'no-cache'
+}
+
+def read_total_pages(feed):
+    """Number of result pages reported by the feed's pagination block, or None if it has none"""
+    pagination = feed['pagination'] if 'pagination' in feed else None
+    if not hasattr(pagination, 'get'):  # dict or lazy simdjson object
+        return None
+    
+    if pagination.get('totalPages'):
+        return int(pagination['totalPages'])
+    if pagination.get('totalItems'):
+        return -(-int(pagination['totalItems']) // FEED_PAGE_SIZE)
+    return None
+
+# Cached page results older than this are refetched in full instead of revalidated
+MAX_CACHE_AGE = 6 * 60 * 60
+
+class RateLimiter:
+    """
+    Thread-safe token bucket: one request every 1/RATE seconds plus up to MAX_JITTER seconds of random
+    delay, with no burst allowance. Pages (an API request plus a section visit every third page) come
+    out about 12-20 seconds apart, the same pace as the old fixed per-page delays, which fast
+    pagination must not beat - the site answers it with a CAPTCHA
+    """
+    
+    RATE = 0.1
+    MAX_TOKENS = 1
+    MAX_JITTER = 5.0
+    
+    def __init__(self):
+        self.tokens = self.MAX_TOKENS
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def wait_for_token(self):
+        """Block until a request may be sent, then consume one token"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.MAX_TOKENS, self.tokens + (now - self.updated_at) * self.RATE)
+                self.updated_at = now
+                
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    break
+                
+                # Sleep exactly until the next token is due instead of polling
+                wait = (1 - self.tokens) / self.RATE
+            
+            time.sleep(wait)
+        
+        # Random delay outside the lock, so requests never go out on a fixed beat
+        time.sleep(random.uniform(0, self.MAX_JITTER))
+
 class AlternativeDatabasePopulator:
     """
     Populates database using different search parameters instead of pagination
@@ -44,42 +152,37 @@ class AlternativeDatabasePopulator:
         # Number of pages to fetch
         self.max_pages = 20
         
-        # Create session with advanced settings
-        self.session = requests.Session()
+        # Set from the feed's pagination block so the crawl stops at the last real page
+        self.total_pages = None
+        
+        # Paces every request this populator sends
+        self.rate_limiter = RateLimiter()
+        
+        # HTTP/2 client when available, otherwise the monitor's pooled keep-alive
+        # session (adapter, retries, cookies and its warm-session state)
+        self.shared_session = httpx is None
+        if self.shared_session:
+            self.session = AdvancedYad2Monitor.get_session()
+        else:
+            self.session = httpx.Client(
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=8, max_connections=8),
+                timeout=30.0
+            )
         self.setup_advanced_session()
+        
+        # Static API-only request headers; the client merges them over its session
+        # headers on each request, and only the Referer changes per page
+        self.api_headers_base = {
+            'Accept': 'application/json',
+            'x-nextjs-data': '1'
+        }
     
     def setup_advanced_session(self):
         """Setup session with advanced anti-detection measures"""
         
-        # Realistic user agents (latest Chrome versions)
-        user_agents = [
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/118.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:109.0) Gecko/20100101 Firefox/119.0'
-        ]
-        
-        selected_ua = random.choice(user_agents)
-        
         # Build realistic headers that match what a real browser sends
-        headers = {
-            'User-Agent': selected_ua,
-            'Accept': '*/*',
-            'Accept-Language': 'he-IL,he;q=0.9,en-US;q=0.8,en;q=0.7',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Referer': 'https://www.yad2.co.il/',
-            'Origin': 'https://www.yad2.co.il',
-            'Connection': 'keep-alive',
-            'Sec-Fetch-Dest': 'empty',
-            'Sec-Fetch-Mode': 'cors', 
-            'Sec-Fetch-Site': 'same-origin',
-            'sec-ch-ua': '"Google Chrome";v="119", "Chromium";v="119", "Not?A_Brand";v="24"',
-            'sec-ch-ua-mobile': '?0',
-            'sec-ch-ua-platform': '"Windows"',
-            'DNT': '1',
-            'Cache-Control': 'no-cache',
-            'Pragma': 'no-cache'
-        }
+        headers = {'User-Agent': random.choice(POPULATOR_USER_AGENTS), **POPULATOR_SESSION_HEADERS}
         
         self.session.headers.update(headers)
         
@@ -92,32 +195,35 @@ class AlternativeDatabasePopulator:
     def simulate_human_browsing(self):
         """Simulate human browsing patterns before making the API call"""
         try:
+            # Cookies warmed by an earlier run in this process are still valid
+            if self.shared_session and AdvancedYad2Monitor.session_is_warm():
+                logger.info("⏩ Session already warm - skipping browsing simulation")
+                return True
+            
             logger.info("🤖 Simulating human browsing behavior...")
             
             # Step 1: Visit main page first
-            main_page_delay = random.uniform(1, 3)
-            time.sleep(main_page_delay)
-            
+            self.rate_limiter.wait_for_token()
             main_response = self.session.get(
                 'https://www.yad2.co.il/',
+                headers=PAGE_VISIT_HEADERS,
                 timeout=10
             )
-            logger.info(f"📄 Visited main page: {main_response.status_code}")
+            logger.debug("📄 Visited main page: %s", main_response.status_code)
             
             # Step 2: Visit real estate section
-            realestate_delay = random.uniform(2, 4)
-            time.sleep(realestate_delay)
-            
+            self.rate_limiter.wait_for_token()
             realestate_response = self.session.get(
                 'https://www.yad2.co.il/realestate/rent',
+                headers=PAGE_VISIT_HEADERS,
                 timeout=10
             )
-            logger.info(f"🏠 Visited realestate section: {realestate_response.status_code}")
+            logger.debug("🏠 Visited realestate section: %s", realestate_response.status_code)
             
             return True
             
         except Exception as e:
-            logger.warning(f"⚠️ Could not complete browsing simulation: {e}")
+            logger.warning("⚠️ Could not complete browsing simulation: %s", e)
             time.sleep(random.uniform(2, 5))  # Fallback delay
             return False
     
@@ -125,42 +231,42 @@ class AlternativeDatabasePopulator:
         """Fetch properties from a specific page using your exact filters"""
         try:
             # Add page parameter to your base params
-            params = self.base_params.copy()
-            if page_number > 1:
-                params['page'] = str(page_number)
+            params = self.base_params if page_number == 1 else {**self.base_params, 'page': str(page_number)}
             
-            # For each new page, add extended delays to avoid CAPTCHA
-            if page_number > 1:
-                # Longer delays for pagination to avoid detection
-                delay = random.uniform(12, 25)  # Much longer delays
-                logger.info(f"⏳ Extended delay before page {page_number}: {delay:.1f}s")
-                time.sleep(delay)
-                
-                # Re-visit sections every few pages to simulate real browsing
-                if page_number % 3 == 0:  # Every 3rd page, simulate more browsing
-                    logger.info(f"🤖 Simulating additional browsing for page {page_number}")
-                    try:
-                        # Visit the real estate section again
-                        browse_response = self.session.get(
-                            'https://www.yad2.co.il/realestate/rent',
-                            timeout=10
-                        )
-                        time.sleep(random.uniform(3, 6))
-                    except:
-                        pass
+            # For each new page, re-visit sections every few pages to simulate real browsing
+            if page_number > 1 and page_number % 3 == 0:  # Every 3rd page, simulate more browsing
+                logger.info("🤖 Simulating additional browsing for page %d", page_number)
+                try:
+                    # Visit the real estate section again
+                    self.rate_limiter.wait_for_token()
+                    browse_response = self.session.get(
+                        'https://www.yad2.co.il/realestate/rent',
+                        headers=PAGE_VISIT_HEADERS,
+                        timeout=10
+                    )
+                except:
+                    pass
             
             # Update headers for API request with fresh referrer
-            api_headers = self.session.headers.copy()
-            api_headers.update({
-                'Accept': 'application/json',
-                'x-nextjs-data': '1',
+            api_headers = {
+                **self.api_headers_base,
                 'Referer': f'https://www.yad2.co.il/realestate/rent{"?page=" + str(page_number) if page_number > 1 else ""}'
-            })
+            }
+            
+            # Revalidate the properties cached the last time this page was fetched
+            cache_key = f"page_cache:{urlencode(sorted(params.items()))}"
+            cached = self.db.get_meta(cache_key)
+            cached = orjson.loads(cached) if cached else None
+            if cached and time.time() - cached['stored_at'] < MAX_CACHE_AGE:
+                if cached['etag']:
+                    api_headers['If-None-Match'] = cached['etag']
+                if cached['last_modified']:
+                    api_headers['If-Modified-Since'] = cached['last_modified']
             
-            logger.info(f"🔍 Fetching page {page_number} with your exact filters...")
-            logger.info(f"📋 Filters: Max ₪5,000, 2.5-5 rooms, Haifa area")
+            logger.info("🔍 Fetching page %d with your exact filters...", page_number)
             
-            # Make the API request
+            # Make the API request once the rate limiter allows it
+            self.rate_limiter.wait_for_token()
             response = self.session.get(
                 self.api_url,
                 params=params,
@@ -168,38 +274,67 @@ class AlternativeDatabasePopulator:
                 timeout=30
             )
             
-            logger.info(f"📡 Page {page_number} response: {response.status_code}")
+            logger.info("📡 Page %d response: %s", page_number, response.status_code)
             
-            # Check response
-            if response.status_code != 200:
-                logger.error(f"❌ HTTP error {response.status_code} on page {page_number}")
+            # Unchanged page - reuse the properties parsed last time
+            if response.status_code == 304:
+                logger.info("✅ Page %d unchanged (304) - using %d cached properties", page_number, len(cached['properties']))
+                return cached['properties']
+            
+            # Check response - blocks, rate limits and server errors each need different handling
+            status = response.status_code
+            if status in (403, 429):
+                logger.warning("🛡️ Page %d blocked (HTTP %d)", page_number, status)
+                if self.shared_session:
+                    AdvancedYad2Monitor.mark_session_warm(False)
+                return []
+            if status >= 500:
+                logger.error("❌ Server error %d on page %d%s",
+                             status, page_number, " (retries exhausted)" if status in RETRY_STATUSES else "")
+                return []
+            if status != 200:
+                logger.error("❌ HTTP error %d on page %d", status, page_number)
                 return []
             
             # Check for CAPTCHA more thoroughly
-            content_preview = response.text[:1000].lower()
-            if any(keyword in content_preview for keyword in ['shieldsquare', 'captcha', 'blocked', 'bot', 'verification']):
-                logger.warning(f"🛡️ CAPTCHA/Bot detection on page {page_number}")
-                logger.info(f"Response preview: {response.text[:200]}")
+            if CAPTCHA_PREVIEW_PATTERN.search(response.content, 0, 1000):
+                logger.warning("🛡️ CAPTCHA/Bot detection on page %d", page_number)
+                if self.shared_session:
+                    AdvancedYad2Monitor.mark_session_warm(False)
+                logger.info("Response preview: %s", response.text[:200])
                 return []
             
-            # Try to parse JSON
+            # Try to parse JSON (lazily with simdjson when installed, so only the feed is materialized)
             try:
-                data = response.json()
-                return self.extract_properties_from_response(data, f"Page {page_number}")
+                data = parse_json_response(response.content)
+                properties = self.extract_properties_from_response(data, f"Page {page_number}")
+                if properties and self.shared_session:
+                    AdvancedYad2Monitor.mark_session_warm()
                 
-            except json.JSONDecodeError as e:
-                logger.error(f"❌ JSON parsing error on page {page_number}: {e}")
-                logger.info(f"Response preview: {response.text[:300]}")
+                # Cache the parsed properties with the validators that describe them
+                etag, last_modified = response.headers.get('ETag'), response.headers.get('Last-Modified')
+                if properties and (etag or last_modified):
+                    self.db.set_meta(cache_key, orjson.dumps({
+                        'etag': etag,
+                        'last_modified': last_modified,
+                        'stored_at': time.time(),
+                        'properties': properties
+                    }).decode())
+                return properties
+                
+            except ValueError as e:  # json, orjson and simdjson decode errors
+                logger.error("❌ JSON parsing error on page %d: %s", page_number, e)
+                logger.info("Response preview: %s", response.text[:300])
                 return []
             
-        except requests.exceptions.Timeout:
-            logger.error(f"⏰ Request timeout on page {page_number}")
+        except TIMEOUT_ERRORS:
+            logger.error("⏰ Request timeout on page %d", page_number)
             return []
-        except requests.exceptions.RequestException as e:
-            logger.error(f"🌐 Network error on page {page_number}: {e}")
+        except NETWORK_ERRORS as e:
+            logger.error("🌐 Network error on page %d: %s", page_number, e)
             return []
         except Exception as e:
-            logger.error(f"❌ Unexpected error on page {page_number}: {e}")
+            logger.error("❌ Unexpected error on page %d: %s", page_number, e)
             return []
     
     def extract_properties_from_response(self, data, search_name):
@@ -208,148 +343,43 @@ class AlternativeDatabasePopulator:
         
         try:
             # The actual structure is pageProps.feed.private for property listings
-            if 'pageProps' in data and 'feed' in data['pageProps']:
-                feed = data['pageProps']['feed']
+            feed = get_feed(data)
+            if feed is not None:
+                total_pages = read_total_pages(feed)
+                if total_pages:
+                    self.total_pages = total_pages
                 
-                # Check for private listings (main property feed)
-                if 'private' in feed:
-                    private_listings = feed['private']
-                    
-                    for item in private_listings:
-                        prop = self.parse_property(item)
-                        if prop:
-                            properties.append(prop)
+                # One pass over every feed type; listings repeated across types are parsed once
+                properties = [prop for prop in map(self.parse_property, collect_feed_listings(feed)) if prop]
                 
-                # Also check for other feed types if they exist
-                for feed_type in ['business', 'promoted']:
-                    if feed_type in feed and isinstance(feed[feed_type], list):
-                        for item in feed[feed_type]:
-                            prop = self.parse_property(item)
-                            if prop:
-                                properties.append(prop)
-                
-                logger.info(f"🏠 {search_name}: extracted {len(properties)} properties")
+                logger.info("🏠 %s: extracted %d properties", search_name, len(properties))
             else:
-                logger.warning(f"⚠️ No feed data found for {search_name}")
+                logger.warning("⚠️ No feed data found for %s", search_name)
                 
         except Exception as e:
-            logger.error(f"❌ Error extracting properties from {search_name}: {e}")
+            logger.error("❌ Error extracting properties from %s: %s", search_name, e)
         
         return properties
     
     def parse_property(self, item):
         """Parse a single property from the API response"""
-        try:
-            # Extract basic property info - using token as ID since it's more unique
-            property_data = {
-                'id': str(item.get('token', item.get('orderId', ''))),
-                'title': '',
-                'price': 0,
-                'rooms': 0,
-                'floor': 0,
-                'size': 0,
-                'images': [],
-                'description': '',
-                'contact_name': '',
-                'phone': '',
-                'address': '',
-                'neighborhood': '',
-                'amenities': []
-            }
-            
-            # Extract price
-            if 'price' in item:
-                try:
-                    property_data['price'] = int(item['price'])
-                except:
-                    property_data['price'] = 0
-            
-            # Extract rooms from additionalDetails
-            if 'additionalDetails' in item:
-                details = item['additionalDetails']
-                if 'roomsCount' in details:
-                    try:
-                        property_data['rooms'] = float(details['roomsCount'])
-                    except:
-                        property_data['rooms'] = 0
-                
-                # Extract size
-                if 'squareMeter' in details:
-                    try:
-                        property_data['size'] = int(details['squareMeter'])
-                    except:
-                        property_data['size'] = 0
-            
-            # Extract floor from address
-            if 'address' in item and 'house' in item['address'] and 'floor' in item['address']['house']:
-                try:
-                    property_data['floor'] = int(item['address']['house']['floor'])
-                except:
-                    property_data['floor'] = 0
-            
-            # Extract address information
-            if 'address' in item:
-                addr = item['address']
-                address_parts = []
-                
-                if 'street' in addr and 'text' in addr['street']:
-                    street = addr['street']['text']
-                    if 'house' in addr and 'number' in addr['house']:
-                        street += f" {addr['house']['number']}"
-                    address_parts.append(street)
-                
-                if 'neighborhood' in addr and 'text' in addr['neighborhood']:
-                    property_data['neighborhood'] = addr['neighborhood']['text']
-                    address_parts.append(property_data['neighborhood'])
-                
-                if 'city' in addr and 'text' in addr['city']:
-                    address_parts.append(addr['city']['text'])
-                
-                property_data['address'] = ', '.join(address_parts)
-            
-            # Extract images from metaData
-            if 'metaData' in item and 'images' in item['metaData']:
-                property_data['images'] = item['metaData']['images']
-            
-            # Extract amenities from tags
-            if 'tags' in item:
-                property_data['amenities'] = [tag.get('name', '') for tag in item['tags'] if tag.get('name')]
-            
-            # Build title
-            room_text = f"{property_data['rooms']} חדרים" if property_data['rooms'] > 0 else ""
-            location_text = property_data['neighborhood'] or 'חיפה'
-            property_type = ""
-            
-            if 'additionalDetails' in item and 'property' in item['additionalDetails'] and 'text' in item['additionalDetails']['property']:
-                property_type = item['additionalDetails']['property']['text']
-            
-            title_parts = []
-            if room_text:
-                title_parts.append(room_text)
-            if property_type:
-                title_parts.append(property_type)
-            if location_text:
-                title_parts.append(f"ב{location_text}")
-            
-            property_data['title'] = ' '.join(title_parts) or f"נכס ב{location_text}"
-            
-            # Extract description from various sources
-            description_parts = []
-            if property_type and property_type not in property_data['title']:
-                description_parts.append(property_type)
-            if property_data['amenities']:
-                description_parts.extend(property_data['amenities'][:3])  # First 3 amenities
-            property_data['description'] = ', '.join(description_parts)
+        record = parse_property(item)
+        return record.to_dict() if record else None
+    
+    def iter_page_results(self):
+        """Yield (page_number, properties) in page order, fetching each batch of pages concurrently"""
+        with ThreadPoolExecutor(max_workers=PAGE_FETCH_WORKERS) as executor:
+            batch_start = 1
             
-            # Only return properties with essential data
-            if property_data['id'] and property_data['price'] > 0 and property_data['address']:
-                return property_data
-            else:
-                return None
-                
-        except Exception as e:
-            logger.error(f"❌ Error parsing property: {e}")
-            return None
+            # The page limit is re-read per batch, as page 1 may have reported the real page count
+            while batch_start <= self.page_limit():
+                pages = range(batch_start, min(batch_start + PAGE_FETCH_WORKERS, self.page_limit() + 1))
+                yield from zip(pages, executor.map(self.fetch_page_properties, pages))
+                batch_start += PAGE_FETCH_WORKERS
+    
+    def page_limit(self):
+        """Last page to fetch: the feed's own page count when known, capped at max_pages"""
+        return min(self.max_pages, self.total_pages or self.max_pages)
     
     def populate_database(self):
         """Main function to populate database with properties from pagination"""
@@ -368,9 +398,7 @@ class AlternativeDatabasePopulator:
             pages_processed = 0
             consecutive_empty_pages = 0
             
-            for page in range(1, self.max_pages + 1):
-                properties = self.fetch_page_properties(page)
-                
+            for page, properties in self.iter_page_results():
                 if properties:
                     # Add to our collection, avoiding duplicates
                     for prop in properties:
@@ -378,19 +406,18 @@ class AlternativeDatabasePopulator:
                     
                     pages_processed += 1
                     consecutive_empty_pages = 0
-                    logger.info(f"✅ Page {page}: Found {len(properties)} properties")
+                    logger.info("✅ Page %d: Found %d properties", page, len(properties))
                 else:
                     consecutive_empty_pages += 1
-                    logger.warning(f"⚠️ Page {page}: No properties found")
+                    logger.warning("⚠️ Page %d: No properties found", page)
                     
                     # If we get 3 consecutive empty pages, likely reached the end
                     if consecutive_empty_pages >= 3:
-                        logger.info(f"🛑 Reached end of results after {page} pages (3 consecutive empty pages)")
+                        logger.info("🛑 Reached end of results after %d pages (3 consecutive empty pages)", page)
                         break
                 
                 # Show progress
-                total_unique = len(all_properties)
-                logger.info(f"📊 Progress: Page {page}/{self.max_pages} - Total unique properties: {total_unique}")
+                logger.info("📊 Progress: Page %d/%d - Total unique properties: %d", page, self.max_pages, len(all_properties))
             
             # Convert back to list
             unique_properties = list(all_properties.values())
@@ -399,18 +426,20 @@ class AlternativeDatabasePopulator:
             if unique_properties:
                 logger.info(f"💾 Processing {len(unique_properties)} unique properties...")
                 
-                new_count = 0
-                updated_count = 0
+                # One transaction for the whole batch instead of one commit per property
+                result = self.db.add_or_update_properties(unique_properties)
+                if result is None:
+                    logger.error("❌ Could not save the fetched properties to the database")
+                    return
+                new_rows, price_change_rows = result
+                new_count = len(new_rows)
+                updated_count = len(price_change_rows)
                 
-                for prop in unique_properties:
-                    is_new, price_changed = self.db.add_or_update_property(prop)
-                    
-                    if is_new:
-                        new_count += 1
-                        logger.info(f"✨ New: {prop['title']} - ₪{prop['price']:,}")
-                    elif price_changed:
-                        updated_count += 1
-                        logger.info(f"💰 Updated: {prop['title']} - ₪{prop['price']:,}")
+                if logger.isEnabledFor(logging.INFO):
+                    for row in new_rows:
+                        logger.info(f"✨ New: {row['title']} - ₪{row['price']:,}")
+                    for row in price_change_rows:
+                        logger.info(f"💰 Updated: {row['title']} - ₪{row['price']:,}")
                 
                 # Get final statistics
                 stats = self.db.get_property_count()
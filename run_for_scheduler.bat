@@ -8,6 +8,10 @@ cd /d "%~dp0"
 REM Activate virtual environment
 call ".venv\Scripts\activate.bat"
 
+REM Export environment variables directly if an env script exists (set VAR=value lines),
+REM so the runner does not have to parse .env on every scheduled run
+if exist ".env.cmd" call ".env.cmd"
+
 REM Run the scheduler runner
 python scheduler_runner.py
 
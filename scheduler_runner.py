@@ -26,7 +26,8 @@ def setup_logging():
     
     # Setup file handler with error handling
     try:
-        file_handler = logging.FileHandler(log_file, encoding='utf-8')
+        # delay=True: the file is only opened once the first record is written
+        file_handler = logging.FileHandler(log_file, encoding='utf-8', delay=True)
         file_handler.setFormatter(formatter)
         file_handler.setLevel(logging.INFO)
     except Exception as e:
@@ -58,11 +59,14 @@ def main():
         logger.info(f"Working directory: {os.getcwd()}")
         logger.info(f"Script location: {os.path.dirname(os.path.abspath(__file__))}")
         
-        # Load environment variables from .env file
+        # Load environment variables from .env file, unless the launcher already exported them
         script_dir = os.path.dirname(os.path.abspath(__file__))
         env_path = os.path.join(script_dir, '.env')
+        required_vars = ['GMAIL_EMAIL', 'GMAIL_APP_PASSWORD']
         
-        if os.path.exists(env_path):
+        if all(os.getenv(var) for var in required_vars):
+            logger.info("✅ Using environment variables exported by the launcher")
+        elif os.path.exists(env_path):
             try:
                 from dotenv import load_dotenv
                 load_dotenv(env_path)
@@ -74,7 +78,6 @@ def main():
             logger.info("Using system environment variables")
         
         # Check if required environment variables are set
-        required_vars = ['GMAIL_EMAIL', 'GMAIL_APP_PASSWORD']
         missing_vars = [var for var in required_vars if not os.getenv(var)]
         
         if missing_vars:
@@ -87,7 +90,12 @@ def main():
         # Run the monitoring cycle
         logger.info("🔄 Starting advanced monitoring cycle...")
         monitor = AdvancedYad2Monitor()
+        
+        # Cookies from the previous scheduled run let this one skip the warmup page visits
+        monitor.restore_session_state()
         monitor.run_monitoring_cycle()
+        monitor.save_session_state()
+        monitor.close()
         
         logger.info("✅ Task Scheduler run completed successfully")
         sys.exit(0)
@@ -1,8 +1,7 @@
 import logging
-import os
 from datetime import datetime
 from yad2_database import Yad2Database
-from yad2_notification_manager import send_property_notifications
+from yad2_notification_manager import send_property_notifications, get_email_recipients
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -19,12 +18,7 @@ def send_status_report():
         changes_24h = db.get_price_changes(hours=24)
         
         # Email recipients from environment variables
-        recipients = [
-            os.getenv('EMAIL_RECIPIENT_1'),
-            os.getenv('EMAIL_RECIPIENT_2')
-        ]
-        # Filter out None values
-        recipients = [email for email in recipients if email]
+        recipients = list(get_email_recipients())
         
         # Send status ONLY if we have new activity (not just existing properties)
         if new_24h or changes_24h:
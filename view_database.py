@@ -1,11 +1,19 @@
 import sqlite3
-import json
+import os
 from datetime import datetime
 
+DB_PATH = 'yad2_properties.db'
+
 def view_database():
     """Simple database viewer for Yad2 properties"""
     try:
-        conn = sqlite3.connect('yad2_properties.db')
+        if not os.path.exists(DB_PATH):
+            raise FileNotFoundError(DB_PATH)
+        
+        # Read-only connection: viewing never writes to the database file itself. The database is in
+        # WAL mode, so SQLite still opens (and may leave behind) the -wal/-shm files in order to see
+        # writes the monitor has not checkpointed yet
+        conn = sqlite3.connect(f'file:{DB_PATH}?mode=ro', uri=True)
         cursor = conn.cursor()
         
         # Check if database exists and has data
@@ -16,12 +24,12 @@ def view_database():
             print("📝 Database is empty - no tables found")
             return
         
-        # Get counts
-        cursor.execute("SELECT COUNT(*) FROM properties")
-        total_count = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM properties WHERE is_active = 1")
-        active_count = cursor.fetchone()[0]
+        # Get all counts in one query (one scan of properties)
+        cursor.execute("""
+            SELECT COUNT(*), COALESCE(SUM(is_active = 1), 0), (SELECT COUNT(*) FROM price_changes)
+            FROM properties
+        """)
+        total_count, active_count, changes_count = cursor.fetchone()
         
         print(f"📊 Database Summary:")
         print(f"   Total Properties: {total_count}")
@@ -55,9 +63,6 @@ def view_database():
             print()
         
         # Show price changes if any
-        cursor.execute("SELECT COUNT(*) FROM price_changes")
-        changes_count = cursor.fetchone()[0]
-        
         if changes_count > 0:
             print(f"💰 Price Changes: {changes_count}")
             
@@ -1,24 +1,126 @@
+import os
 import sqlite3
-import json
+import orjson
 import logging
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional, Tuple
 import hashlib
+import threading
+from functools import lru_cache, partial
+from operator import attrgetter, itemgetter
+
+# Prepared statements kept per connection (sqlite3 default is 128)
+STATEMENT_CACHE_SIZE = 256
+
+# Plain row columns in upsert statement order; the JSON columns, timestamps and keys are appended per statement
+UPSERT_VALUE_COLUMNS = (
+    'title', 'price', 'rooms', 'floor', 'size', 'address', 'neighborhood',
+    'contact_name', 'phone', 'description'
+)
+# Each reads a row's values in one C-level call
+_UPDATE_COLUMNS = itemgetter(*UPSERT_VALUE_COLUMNS)
+_INSERT_COLUMNS = itemgetter('id', 'yad2_id', *UPSERT_VALUE_COLUMNS)
+
+# Input fields in _format_row's order, with dict defaults; parsed records always carry every field,
+# so they are read with a single attrgetter call
+ROW_INPUT_FIELDS = (
+    ('id', ''), ('title', ''), ('address', ''), ('rooms', ''), ('price', 0), ('floor', 0), ('size', 0),
+    ('neighborhood', ''), ('contact_name', ''), ('phone', ''), ('description', ''), ('images', []), ('amenities', [])
+)
+_RECORD_FIELDS = attrgetter(*(name for name, _ in ROW_INPUT_FIELDS))
+
+# Batch upsert statements, parameter order matching the getters above
+INSERT_PROPERTY_SQL = '''
+    INSERT INTO properties (
+        id, yad2_id, title, price, rooms, floor, size,
+        address, neighborhood, contact_name, phone,
+        description, images, amenities, first_seen,
+        last_seen, is_active
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+UPDATE_PROPERTY_SQL = '''
+    UPDATE properties SET
+        title = ?, price = ?, rooms = ?, floor = ?, size = ?,
+        address = ?, neighborhood = ?, contact_name = ?, phone = ?,
+        description = ?, images = ?, amenities = ?, last_seen = ?,
+        is_active = 1 WHERE id = ?
+'''
+# Property columns returned to callers (older databases also carry unused price_history/raw_data columns)
+PROPERTY_RESULT_COLUMNS = '''
+    p.id, p.yad2_id, p.title, p.price, p.rooms, p.floor, p.size, p.address, p.neighborhood,
+    p.contact_name, p.phone, p.description, p.images, p.amenities, p.first_seen, p.last_seen, p.is_active
+'''
+NEW_PROPERTIES_SQL = f'''
+    SELECT {PROPERTY_RESULT_COLUMNS} FROM properties p
+    WHERE p.first_seen >= ? AND p.is_active = 1
+    ORDER BY p.first_seen DESC
+'''
+PRICE_CHANGES_SQL = f'''
+    SELECT {PROPERTY_RESULT_COLUMNS}, pc.old_price, pc.new_price, pc.change_date
+    FROM properties p
+    JOIN price_changes pc ON p.id = pc.property_id
+    WHERE pc.change_date >= ? AND p.is_active = 1
+    ORDER BY pc.change_date DESC
+'''
+INSERT_PRICE_CHANGE_SQL = '''
+    INSERT INTO price_changes (property_id, old_price, new_price, change_date)
+    VALUES (?, ?, ?, ?)
+'''
+
+def encode_json_list(values) -> str:
+    """JSON text for a list column; empty lists (most amenities) skip the encoder"""
+    return orjson.dumps(values).decode() if values else '[]'
 
 class Yad2Database:
     """Clean SQLite database handler for Yad2 property monitoring."""
     
+    # Database files whose schema this process has already created or verified
+    _schema_ready = set()
+    
     def __init__(self, db_path: str = 'yad2_properties.db'):
         self.db_path = db_path
         self.logger = logging.getLogger(__name__)
-        self.init_database()
+        # One long-lived connection per thread, so prepared statements are reused across calls
+        self._local = threading.local()
+        if os.path.abspath(db_path) not in Yad2Database._schema_ready:
+            self.init_database()
+    
+    def _connect(self) -> sqlite3.Connection:
+        """This thread's connection, opened with per-connection PRAGMAs on first use.
+        Callers use it as a context manager, which commits or rolls back but leaves it open."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # Wait up to 60s for another writer instead of failing with "database is locked"
+            conn = sqlite3.connect(self.db_path, timeout=60, cached_statements=STATEMENT_CACHE_SIZE)
+            # Safe with WAL: only a checkpoint fsyncs, not every commit
+            conn.execute('PRAGMA synchronous=NORMAL')
+            # Temp tables/sorts in RAM, a 64 MB page cache and reads through a 256 MB mmap
+            conn.execute('PRAGMA temp_store=MEMORY')
+            conn.execute('PRAGMA cache_size=-65536')
+            conn.execute('PRAGMA mmap_size=268435456')
+            self._local.conn = conn
+        return conn
+    
+    def close(self):
+        """Close this thread's connection (the next call opens a new one)."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
     
     def init_database(self):
         """Initialize the database with necessary tables."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 
+                # 8 KB pages for the wide property rows; only takes effect on a new, empty file
+                # (must precede WAL, after which the page size is fixed)
+                cursor.execute('PRAGMA page_size=8192')
+                
+                # WAL is persistent in the file; commits append instead of rewriting pages
+                cursor.execute('PRAGMA journal_mode=WAL')
+                
                 # Properties table
                 cursor.execute('''
                     CREATE TABLE IF NOT EXISTS properties (
@@ -38,8 +140,6 @@ class Yad2Database:
                         amenities TEXT,
                         first_seen TIMESTAMP,
                         last_seen TIMESTAMP,
-                        price_history TEXT,
-                        raw_data TEXT,
                         is_active BOOLEAN DEFAULT 1
                     )
                 ''')
@@ -47,7 +147,7 @@ class Yad2Database:
                 # Price changes table
                 cursor.execute('''
                     CREATE TABLE IF NOT EXISTS price_changes (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        id INTEGER PRIMARY KEY,
                         property_id TEXT,
                         old_price INTEGER,
                         new_price INTEGER,
@@ -56,8 +156,36 @@ class Yad2Database:
                     )
                 ''')
                 
+                # Indexes for the time-window queries; the partial ones only hold active rows,
+                # which is all get_new_properties / cleanup_old_properties ever look at
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_properties_active_first_seen
+                    ON properties (first_seen) WHERE is_active = 1
+                ''')
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_properties_active_last_seen
+                    ON properties (last_seen) WHERE is_active = 1
+                ''')
+                # Newest-first listing of all properties (view_database) walks this index backwards
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_properties_first_seen ON properties (first_seen)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_price_changes_date ON price_changes (change_date)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_price_changes_property ON price_changes (property_id)')
+                
+                # Small key/value store for state such as the last feed ETag
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS meta (
+                        key TEXT PRIMARY KEY,
+                        value TEXT
+                    )
+                ''')
+                
                 conn.commit()
+                
+                # Refresh planner statistics where they are missing or stale (cheap when nothing changed)
+                cursor.execute('PRAGMA optimize')
+                
                 self.logger.info("Database initialized successfully")
+                Yad2Database._schema_ready.add(os.path.abspath(self.db_path))
                 
         except Exception as e:
             self.logger.error(f"Database initialization error: {e}")
@@ -65,107 +193,184 @@ class Yad2Database:
     
     def generate_property_id(self, property_data: Dict[str, Any]) -> str:
         """Generate a unique ID for a property based on key characteristics."""
+        return self._property_key(property_data.get('title', ''), property_data.get('address', ''), property_data.get('rooms', ''))
+    
+    @staticmethod
+    @lru_cache(maxsize=4096, typed=True)
+    def _property_key(title: str, address: str, rooms: Any) -> str:
+        """Hash of the fields that identify a property across listings.
+        Cached, since the same listings come back every cycle; typed, as 3 and 3.0 hash differently."""
         # Use address and title for unique identification
-        key_data = f"{property_data.get('title', '')}{property_data.get('address', '')}{property_data.get('rooms', '')}"
-        return hashlib.md5(key_data.encode()).hexdigest()
+        # (MD5 stays: stored ids are these digests, so another hash would re-add every property)
+        return hashlib.md5(f"{title}{address}{rooms}".encode()).hexdigest()
     
     def add_or_update_property(self, property_data: Dict[str, Any]) -> Tuple[bool, bool]:
         """Add or update property in database. Returns: (is_new, price_changed)"""
+        return self.bulk_add_or_update([property_data])[0]
+    
+    def bulk_add_or_update(self, properties: List[Dict[str, Any]]) -> List[Tuple[bool, bool]]:
+        """Add or update many properties (dicts or parsed records) in one transaction. Returns (is_new, price_changed) per property, in input order."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
+                # Take the write lock up front so every existence check and write is one atomic transaction
+                conn.execute('BEGIN IMMEDIATE')
                 cursor = conn.cursor()
+                current_time = datetime.now()
+                results = self._upsert_batch(cursor, properties, current_time)
+                conn.commit()
+                return [(is_new, old_price is not None) for _, is_new, old_price in results]
                 
-                # Generate unique ID
-                property_id = self.generate_property_id(property_data)
-                yad2_id = str(property_data.get('id', ''))
+        except Exception as e:
+            self.logger.error(f"Error adding/updating properties: {e}")
+            return [(False, False)] * len(properties)
+    
+    def add_or_update_properties(self, properties: List[Dict[str, Any]], batch_key: Optional[str] = None) -> Optional[Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]]:
+        """Add or update many properties in one transaction.
+        If batch_key is given, the ids of the stored rows are saved under that meta key in the same
+        transaction, for refresh_last_seen.
+        Returns (new_rows, price_change_rows) shaped like get_new_properties / get_price_changes,
+        or None if the transaction failed and nothing was written."""
+        new_rows = []
+        price_change_rows = []
+        
+        try:
+            with self._connect() as conn:
+                # Take the write lock up front so every existence check and write is one atomic transaction
+                conn.execute('BEGIN IMMEDIATE')
+                cursor = conn.cursor()
+                current_time = datetime.now()
                 
-                # Check if property exists
-                cursor.execute('SELECT id, price FROM properties WHERE id = ? OR yad2_id = ?', 
-                             (property_id, yad2_id))
-                existing = cursor.fetchone()
+                results = self._upsert_batch(cursor, properties, current_time)
+                if batch_key:
+                    cursor.execute(
+                        'INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)',
+                        (batch_key, orjson.dumps([row['id'] for row, _, _ in results]).decode())
+                    )
                 
-                current_price = int(property_data.get('price', 0))
-                current_time = datetime.now()
+                for row, is_new, old_price in results:
+                    if is_new:
+                        new_rows.append(row)
+                    elif old_price is not None:
+                        price_change_rows.append({
+                            **row,
+                            'old_price': old_price,
+                            'new_price': row['price'],
+                            'change_date': row['last_seen']
+                        })
+                
+                conn.commit()
                 
-                if existing:
-                    # Property exists - check for price change
-                    existing_id, existing_price = existing
-                    price_changed = existing_price != current_price
-                    
-                    if price_changed:
-                        # Record price change
-                        cursor.execute('''
-                            INSERT INTO price_changes (property_id, old_price, new_price, change_date)
-                            VALUES (?, ?, ?, ?)
-                        ''', (existing_id, existing_price, current_price, current_time))
-                    
-                    # Update existing property
-                    cursor.execute('''
-                        UPDATE properties SET
-                            title = ?, price = ?, rooms = ?, floor = ?, size = ?,
-                            address = ?, neighborhood = ?, contact_name = ?, phone = ?,
-                            description = ?, images = ?, amenities = ?, last_seen = ?,
-                            is_active = 1 WHERE id = ?
-                    ''', (
-                        property_data.get('title', ''),
-                        current_price,
-                        float(property_data.get('rooms', 0)),
-                        int(property_data.get('floor', 0)),
-                        int(property_data.get('size', 0)),
-                        property_data.get('address', ''),
-                        property_data.get('neighborhood', ''),
-                        property_data.get('contact_name', ''),
-                        property_data.get('phone', ''),
-                        property_data.get('description', ''),
-                        json.dumps(property_data.get('images', [])),
-                        json.dumps(property_data.get('amenities', [])),
-                        current_time,
-                        existing_id
-                    ))
-                    
-                    conn.commit()
-                    return False, price_changed
-                
-                else:
-                    # New property
-                    cursor.execute('''
-                        INSERT INTO properties (
-                            id, yad2_id, title, price, rooms, floor, size,
-                            address, neighborhood, contact_name, phone,
-                            description, images, amenities, first_seen,
-                            last_seen, is_active
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        property_id, yad2_id, property_data.get('title', ''),
-                        current_price, float(property_data.get('rooms', 0)),
-                        int(property_data.get('floor', 0)), int(property_data.get('size', 0)),
-                        property_data.get('address', ''), property_data.get('neighborhood', ''),
-                        property_data.get('contact_name', ''), property_data.get('phone', ''),
-                        property_data.get('description', ''), json.dumps(property_data.get('images', [])),
-                        json.dumps(property_data.get('amenities', [])), current_time, current_time, 1
-                    ))
-                    
-                    conn.commit()
-                    return True, False
-                    
         except Exception as e:
-            self.logger.error(f"Error adding/updating property: {e}")
-            return False, False
+            self.logger.error(f"Error adding/updating properties: {e}")
+            return None
+        
+        return new_rows, price_change_rows
+    
+    def _format_row(self, property_data, timestamp: str) -> Dict[str, Any]:
+        """Build the stored row for one property (dict or parsed record)"""
+        # Parsed records are read in one C-level call instead of being copied into a dict first
+        if isinstance(property_data, dict):
+            get = property_data.get
+            values = [get(name, default) for name, default in ROW_INPUT_FIELDS]
+        else:
+            values = _RECORD_FIELDS(property_data)
+        (yad2_id, title, address, rooms, price, floor, size,
+         neighborhood, contact_name, phone, description, images, amenities) = values
+        
+        return {
+            'id': self._property_key(title, address, rooms),
+            'yad2_id': str(yad2_id),
+            'title': title,
+            'price': int(price),
+            'rooms': float(rooms or 0),
+            'floor': int(floor),
+            'size': int(size),
+            'address': address,
+            'neighborhood': neighborhood,
+            'contact_name': contact_name,
+            'phone': phone,
+            'description': description,
+            'images': images,
+            'amenities': amenities,
+            'first_seen': timestamp,
+            'last_seen': timestamp,
+            'is_active': 1
+        }
+    
+    def _upsert_batch(self, cursor, properties: List[Dict[str, Any]], current_time: datetime) -> List[Tuple[Dict[str, Any], bool, Optional[int]]]:
+        """Insert or update many properties using an open cursor: one pre-read of the existing rows,
+        then one executemany per statement. Results match upserting the properties one by one.
+        Returns per property: (stored row as read back by the getters, is_new, old price if the price changed)"""
+        # Timestamps in the same text form sqlite3 stores and returns them
+        timestamp = current_time.isoformat(' ')
+        
+        rows = list(map(partial(self._format_row, timestamp=timestamp), properties))
+        
+        # Existing rows by id and by yad2_id in one lookup; the keys go in as two JSON arrays,
+        # so the statement text is the same for every batch size and no variable limit applies
+        by_id = {}
+        by_yad2_id = {}
+        cursor.execute(
+            'SELECT id, yad2_id, price, first_seen FROM properties '
+            'WHERE id IN (SELECT value FROM json_each(?)) OR yad2_id IN (SELECT value FROM json_each(?))',
+            (orjson.dumps([row['id'] for row in rows]).decode(), orjson.dumps([row['yad2_id'] for row in rows]).decode())
+        )
+        for existing in cursor.fetchall():
+            by_id[existing[0]] = existing
+            by_yad2_id[existing[1]] = existing
+        
+        inserts = []
+        updates = []
+        price_changes = []
+        results = []
+        for row in rows:
+            existing = by_id.get(row['id']) or by_yad2_id.get(row['yad2_id'])
+            images_json = encode_json_list(row['images'])
+            amenities_json = encode_json_list(row['amenities'])
+            
+            if existing:
+                # Property exists - check for price change
+                existing_id, existing_yad2_id, existing_price, first_seen = existing
+                row['id'] = existing_id
+                row['first_seen'] = first_seen
+                price_changed = existing_price != row['price']
+                
+                if price_changed:
+                    price_changes.append((existing_id, existing_price, row['price'], timestamp))
+                
+                updates.append((*_UPDATE_COLUMNS(row), images_json, amenities_json, timestamp, existing_id))
+                results.append((row, False, existing_price if price_changed else None))
+                stored = (existing_id, existing_yad2_id, row['price'], first_seen)
+            else:
+                inserts.append((*_INSERT_COLUMNS(row), images_json, amenities_json, timestamp, timestamp, 1))
+                results.append((row, True, None))
+                stored = (row['id'], row['yad2_id'], row['price'], timestamp)
+            
+            # Later duplicates in this batch see the row as it will be stored
+            by_id[stored[0]] = stored
+            by_yad2_id[stored[1]] = stored
+        
+        # New properties first, so an update of one seen twice in the batch finds its row
+        cursor.executemany(INSERT_PROPERTY_SQL, inserts)
+        
+        # Record price changes
+        cursor.executemany(INSERT_PRICE_CHANGE_SQL, price_changes)
+        
+        # Update existing properties
+        cursor.executemany(UPDATE_PROPERTY_SQL, updates)
+        
+        return results
     
     def get_new_properties(self, hours: int = 24) -> List[Dict[str, Any]]:
         """Get properties added in the last N hours."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cutoff_time = datetime.now() - timedelta(hours=hours)
                 
-                cursor.execute('''
-                    SELECT * FROM properties 
-                    WHERE first_seen >= ? AND is_active = 1
-                    ORDER BY first_seen DESC
-                ''', (cutoff_time,))
+                cursor.execute(NEW_PROPERTIES_SQL, (cutoff_time.isoformat(' '),))
                 
-                return [self._row_to_dict(cursor, row) for row in cursor.fetchall()]
+                return self._rows_to_dicts(cursor)
                 
         except Exception as e:
             self.logger.error(f"Error getting new properties: {e}")
@@ -174,41 +379,51 @@ class Yad2Database:
     def get_price_changes(self, hours: int = 24) -> List[Dict[str, Any]]:
         """Get properties with price changes in the last N hours."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cutoff_time = datetime.now() - timedelta(hours=hours)
                 
-                cursor.execute('''
-                    SELECT p.*, pc.old_price, pc.new_price, pc.change_date
-                    FROM properties p
-                    JOIN price_changes pc ON p.id = pc.property_id
-                    WHERE pc.change_date >= ? AND p.is_active = 1
-                    ORDER BY pc.change_date DESC
-                ''', (cutoff_time,))
+                cursor.execute(PRICE_CHANGES_SQL, (cutoff_time.isoformat(' '),))
                 
-                return [self._row_to_dict(cursor, row) for row in cursor.fetchall()]
+                return self._rows_to_dicts(cursor)
                 
         except Exception as e:
             self.logger.error(f"Error getting price changes: {e}")
             return []
     
+    def refresh_last_seen(self, batch_key: str):
+        """Mark the listings of the upsert saved under batch_key as seen now (for an unchanged feed)."""
+        try:
+            with self._connect() as conn:
+                # Exactly the ids that upsert recorded, so other writers (the populator) don't matter
+                conn.execute('''
+                    UPDATE properties SET last_seen = ?
+                    WHERE is_active = 1 AND id IN (
+                        SELECT value FROM json_each((SELECT value FROM meta WHERE key = ?))
+                    )
+                ''', (datetime.now().isoformat(' '), batch_key))
+                conn.commit()
+                
+        except Exception as e:
+            self.logger.error(f"Error refreshing last seen: {e}")
+    
     def cleanup_old_properties(self, days: int = 14):
         """Mark properties as inactive if not seen for N days."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 cutoff_time = datetime.now() - timedelta(days=days)
                 
                 cursor.execute('''
                     UPDATE properties SET is_active = 0 
                     WHERE last_seen < ? AND is_active = 1
-                ''', (cutoff_time,))
+                ''', (cutoff_time.isoformat(' '),))
                 
                 updated_count = cursor.rowcount
                 conn.commit()
                 
                 if updated_count > 0:
-                    self.logger.info(f"Marked {updated_count} properties as inactive")
+                    self.logger.info("Marked %d properties as inactive", updated_count)
                 
         except Exception as e:
             self.logger.error(f"Error cleaning up old properties: {e}")
@@ -216,37 +431,68 @@ class Yad2Database:
     def get_property_count(self) -> Dict[str, int]:
         """Get statistics about properties in database."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.cursor()
                 
-                cursor.execute('SELECT COUNT(*) FROM properties WHERE is_active = 1')
-                active_count = cursor.fetchone()[0]
-                
-                cursor.execute('SELECT COUNT(*) FROM properties')
-                total_count = cursor.fetchone()[0]
+                # Both property counts from a single scan, plus the last day's price changes
+                # (an index range on change_date) in the same statement
+                cutoff_time = datetime.now() - timedelta(hours=24)
+                cursor.execute('''
+                    SELECT COUNT(*), COALESCE(SUM(is_active = 1), 0),
+                           (SELECT COUNT(*) FROM price_changes WHERE change_date >= ?)
+                    FROM properties
+                ''', (cutoff_time.isoformat(' '),))
+                total_count, active_count, recent_changes = cursor.fetchone()
                 
                 return {
                     'active': active_count,
                     'total': total_count,
-                    'recent_price_changes': 0
+                    'recent_price_changes': recent_changes
                 }
                 
         except Exception as e:
             self.logger.error(f"Error getting property count: {e}")
             return {'active': 0, 'total': 0, 'recent_price_changes': 0}
     
-    def _row_to_dict(self, cursor, row) -> Dict[str, Any]:
-        """Convert database row to dictionary."""
+    def get_meta(self, key: str) -> Optional[str]:
+        """Get a stored metadata value, or None if unset."""
+        try:
+            with self._connect() as conn:
+                row = conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+                return row[0] if row else None
+                
+        except Exception as e:
+            self.logger.error(f"Error reading meta {key}: {e}")
+            return None
+    
+    def set_meta(self, key: str, value: str):
+        """Store a metadata value, replacing any previous one."""
+        try:
+            with self._connect() as conn:
+                conn.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', (key, value))
+                conn.commit()
+                
+        except Exception as e:
+            self.logger.error(f"Error writing meta {key}: {e}")
+    
+    def _rows_to_dicts(self, cursor) -> List[Dict[str, Any]]:
+        """Convert the cursor's remaining rows to dictionaries (column names read once per query)."""
         columns = [desc[0] for desc in cursor.description]
-        row_dict = dict(zip(columns, row))
+        json_fields = [field for field in ('images', 'amenities') if field in columns]
         
-        # Parse JSON fields
-        json_fields = ['images', 'amenities']
-        for field in json_fields:
-            if field in row_dict and row_dict[field]:
-                try:
-                    row_dict[field] = json.loads(row_dict[field])
-                except (json.JSONDecodeError, TypeError):
-                    row_dict[field] = []
+        # Rows are pulled from the cursor one at a time, without an intermediate list of tuples
+        rows = []
+        for row in cursor:
+            row_dict = dict(zip(columns, row))
+            
+            # Parse JSON fields
+            for field in json_fields:
+                if row_dict[field]:
+                    try:
+                        row_dict[field] = orjson.loads(row_dict[field])
+                    except (orjson.JSONDecodeError, TypeError):
+                        row_dict[field] = []
+            
+            rows.append(row_dict)
         
-        return row_dict
\ No newline at end of file
+        return rows
@@ -1,12 +1,25 @@
 import smtplib
 import os
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+import functools
+from html import escape
+from email.message import EmailMessage
 from typing import List, Dict, Any
 import logging
 
 logger = logging.getLogger(__name__)
 
+@functools.lru_cache(maxsize=None)
+def get_email_recipients() -> tuple:
+    """Email recipients from environment variables, read once per process."""
+    recipients = (os.getenv('EMAIL_RECIPIENT_1'), os.getenv('EMAIL_RECIPIENT_2'))
+    # Filter out None values
+    return tuple(email for email in recipients if email)
+
+@functools.lru_cache(maxsize=None)
+def get_gmail_credentials() -> tuple:
+    """Gmail sender address and app password from environment variables, read once per process."""
+    return os.getenv('GMAIL_EMAIL'), os.getenv('GMAIL_APP_PASSWORD')
+
 def send_property_notifications(new_properties: List[Dict[str, Any]], 
                                price_changes: List[Dict[str, Any]], 
                                recipients: List[str]):
@@ -17,13 +30,16 @@ def send_property_notifications(new_properties: List[Dict[str, Any]],
         return
     
     # Get Gmail credentials from environment
-    gmail_user = os.getenv('GMAIL_EMAIL')
-    gmail_password = os.getenv('GMAIL_APP_PASSWORD')
+    gmail_user, gmail_password = get_gmail_credentials()
     
     if not gmail_user or not gmail_password:
         logger.error("Gmail credentials not found in environment variables")
         return
     
+    if not recipients:
+        logger.error("No email recipients configured")
+        return
+    
     try:
         # Create more specific email subject
         if new_properties and price_changes:
@@ -37,20 +53,17 @@ def send_property_notifications(new_properties: List[Dict[str, Any]],
             
         html_body = create_email_html(new_properties, price_changes)
         
-        # Create message
-        msg = MIMEMultipart('alternative')
+        # Create a single-part HTML message (no multipart wrapper for one body)
+        msg = EmailMessage()
         msg['From'] = gmail_user
         msg['To'] = ', '.join(recipients)
         msg['Subject'] = subject
+        msg.set_content(html_body, subtype='html', charset='utf-8')
         
-        # Add HTML body
-        html_part = MIMEText(html_body, 'html', 'utf-8')
-        msg.attach(html_part)
-        
-        # Send email
+        # Send email - one connection and one multi-RCPT envelope for all recipients
         with smtplib.SMTP_SSL('smtp.gmail.com', 465) as server:
             server.login(gmail_user, gmail_password)
-            server.send_message(msg)
+            server.send_message(msg, from_addr=gmail_user, to_addrs=recipients)
         
         logger.info(f"Email sent successfully to {len(recipients)} recipients")
         
@@ -58,11 +71,8 @@ def send_property_notifications(new_properties: List[Dict[str, Any]],
         logger.error(f"Failed to send email: {e}")
         raise
 
-def create_email_html(new_properties: List[Dict[str, Any]], 
-                     price_changes: List[Dict[str, Any]]) -> str:
-    """Create HTML email content for property notifications."""
-    
-    html = """
+# Static start and end of the notification email
+EMAIL_HTML_HEAD = """
     <!DOCTYPE html>
     <html>
     <head>
@@ -83,90 +93,108 @@ def create_email_html(new_properties: List[Dict[str, Any]],
     </head>
     <body>
     """
+
+EMAIL_HTML_FOOTER = """
+        <hr style="margin: 30px 0;">
+        <p style="color: #888; font-size: 12px;">
+            This is an automated notification from Yad2 Haifa Property Monitor.<br>
+            Running every 10 minutes via GitHub Actions to find you the best rentals! 🏠✨
+        </p>
+    </body>
+    </html>
+    """
+
+def create_email_html(new_properties: List[Dict[str, Any]], 
+                     price_changes: List[Dict[str, Any]]) -> str:
+    """Create HTML email content for property notifications."""
     
-    html += f"""
+    # Fragments are collected and joined once instead of re-copying the growing string
+    parts = [EMAIL_HTML_HEAD]
+    append = parts.append
+    
+    append(f"""
         <div class="header">
             <h1>🏠 Yad2 Haifa Property Monitor</h1>
             <p>Update from {new_properties[0]['first_seen'][:10] if new_properties else price_changes[0]['change_date'][:10]}</p>
         </div>
-    """
+    """)
     
     # New properties section
     if new_properties:
-        html += f"""
-        <h2>✨ {len(new_properties)} New Properties</h2>
-        """
+        new_count = len(new_properties)
+        append(f"""
+        <h2>✨ {new_count} New Properties</h2>
+        """)
         
         # Limit to first 10 properties to avoid huge emails
         for prop in new_properties[:10]:
-            price = int(prop.get('price', 0))
+            # Bound once per property; each card reads up to ten fields
+            get = prop.get
+            price = int(get('price', 0))
+            # Listing text comes from the site, so it is escaped once before going into the markup
+            title = escape(str(get('title', 'No title')))
+            address = escape(str(get('address', 'No address')))
+            neighborhood = escape(str(get('neighborhood', '')))
             is_good_deal = price <= 4000
             
             css_class = "property new"
             if is_good_deal:
                 css_class += " good-deal"
             
-            html += f"""
+            append(f"""
             <div class="{css_class}">
-                <div class="title">{prop.get('title', 'No title')}</div>
+                <div class="title">{title}</div>
                 <div class="price">₪{price:,}</div>
                 <div class="details">
-                    📍 {prop.get('address', 'No address')} - {prop.get('neighborhood', '')}
+                    📍 {address} - {neighborhood}
                 </div>
                 <div class="details">
-                    🏠 {prop.get('rooms', 0)} rooms • 📐 {prop.get('size', 0)}m² • 🏢 Floor {prop.get('floor', 'N/A')}
+                    🏠 {get('rooms', 0)} rooms • 📐 {get('size', 0)}m² • 🏢 Floor {get('floor', 'N/A')}
                 </div>
-            """
+            """)
             
-            if prop.get('amenities'):
-                amenities = ', '.join([a for a in prop['amenities'][:3] if a])  # First 3 amenities
+            if get('amenities'):
+                amenities = escape(', '.join([a for a in prop['amenities'][:3] if a]))  # First 3 amenities
                 if amenities:
-                    html += f'<div class="amenities">✨ {amenities}</div>'
+                    append(f'<div class="amenities">✨ {amenities}</div>')
             
-            if prop.get('contact_name') or prop.get('phone'):
-                html += f"""
+            if get('contact_name') or get('phone'):
+                append(f"""
                 <div class="contact">
-                    📞 {prop.get('contact_name', 'Contact')}: {prop.get('phone', 'No phone')}
+                    📞 {escape(str(get('contact_name', 'Contact')))}: {escape(str(get('phone', 'No phone')))}
                 </div>
-                """
+                """)
             
-            html += "</div>"
+            append("</div>")
         
-        if len(new_properties) > 10:
-            html += f"<p><i>... and {len(new_properties) - 10} more new properties</i></p>"
+        if new_count > 10:
+            append(f"<p><i>... and {new_count - 10} more new properties</i></p>")
     
     # Price changes section
     if price_changes:
-        html += f"""
+        append(f"""
         <h2>💰 {len(price_changes)} Price Changes</h2>
-        """
+        """)
         
         for change in price_changes[:5]:  # Show first 5 price changes
-            old_price = int(change.get('old_price', 0))
-            new_price = int(change.get('new_price', 0))
+            get = change.get
+            old_price = int(get('old_price', 0))
+            new_price = int(get('new_price', 0))
             change_amount = new_price - old_price
             change_direction = "📈" if change_amount > 0 else "📉"
             
-            html += f"""
+            append(f"""
             <div class="property price-change">
-                <div class="title">{change.get('title', 'No title')}</div>
+                <div class="title">{escape(str(get('title', 'No title')))}</div>
                 <div class="price">
                     ₪{old_price:,} → ₪{new_price:,} ({change_direction} {change_amount:+,})
                 </div>
                 <div class="details">
-                    📍 {change.get('address', 'No address')}
+                    📍 {escape(str(get('address', 'No address')))}
                 </div>
             </div>
-            """
+            """)
     
-    html += """
-        <hr style="margin: 30px 0;">
-        <p style="color: #888; font-size: 12px;">
-            This is an automated notification from Yad2 Haifa Property Monitor.<br>
-            Running every 10 minutes via GitHub Actions to find you the best rentals! 🏠✨
-        </p>
-    </body>
-    </html>
-    """
+    append(EMAIL_HTML_FOOTER)
     
-    return html
\ No newline at end of file
+    return ''.join(parts)
\ No newline at end of file
@@ -0,0 +1,151 @@
+"""
+Pure parsing of Yad2 API listings into PropertyRecord objects
+Kept free of network/database imports and fully annotated so it can be
+compiled ahead of time with mypyc (`mypyc yad2_parser.py`); the compiled
+extension is picked up transparently by `import yad2_parser`
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Listing fields as (output key, path into the listing, coercion, default)
+SchemaEntry = Tuple[str, Tuple[str, ...], Callable[[Any], Any], Any]
+
+PROPERTY_SCHEMA: Tuple[SchemaEntry, ...] = (
+    ('price', ('price',), int, 0),
+    ('rooms', ('additionalDetails', 'roomsCount'), float, 0),
+    ('size', ('additionalDetails', 'squareMeter'), int, 0),
+    ('floor', ('address', 'house', 'floor'), int, 0),
+    ('neighborhood', ('address', 'neighborhood', 'text'), str, ''),
+    ('images', ('metaData', 'images'), list, ()),
+    ('property_type', ('additionalDetails', 'property', 'text'), str, ''),
+    ('street', ('address', 'street', 'text'), str, ''),
+    ('house_number', ('address', 'house', 'number'), str, ''),
+    ('city', ('address', 'city', 'text'), str, ''),
+)
+
+@dataclass(slots=True)
+class PropertyRecord:
+    """A parsed listing; slotted to keep per-listing memory small"""
+    id: str
+    title: str = ''
+    price: int = 0
+    rooms: float = 0
+    floor: int = 0
+    size: int = 0
+    address: str = ''
+    neighborhood: str = ''
+    description: str = ''
+    contact_name: str = ''
+    phone: str = ''
+    images: List[Any] = field(default_factory=list)
+    amenities: List[str] = field(default_factory=list)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Shallow dict view for the database layer"""
+        return {
+            'id': self.id,
+            'title': self.title,
+            'price': self.price,
+            'rooms': self.rooms,
+            'floor': self.floor,
+            'size': self.size,
+            'address': self.address,
+            'neighborhood': self.neighborhood,
+            'description': self.description,
+            'contact_name': self.contact_name,
+            'phone': self.phone,
+            'images': self.images,
+            'amenities': self.amenities
+        }
+
+# Schema compiled so every shared section (address, address.house, ...) is looked up
+# once per listing: sections are (parent index, key) resolved in order into a node list,
+# fields are (output key, section index, key, coercion, default)
+SchemaPlan = Tuple[Tuple[Tuple[int, str], ...], Tuple[Tuple[str, int, str, Callable[[Any], Any], Any], ...]]
+
+def compile_schema(schema: Tuple[SchemaEntry, ...]) -> SchemaPlan:
+    """Turn schema paths into a section table plus per-field section indexes"""
+    section_index: Dict[Tuple[str, ...], int] = {(): 0}
+    sections: List[Tuple[int, str]] = []
+    for _, path, _, _ in schema:
+        for depth in range(1, len(path)):
+            prefix = path[:depth]
+            if prefix not in section_index:
+                section_index[prefix] = len(sections) + 1
+                sections.append((section_index[prefix[:-1]], prefix[-1]))
+    fields = tuple((out_key, section_index[path[:-1]], path[-1], coerce, default)
+                   for out_key, path, coerce, default in schema)
+    return tuple(sections), fields
+
+PROPERTY_PLAN = compile_schema(PROPERTY_SCHEMA)
+
+def extract_fields(item: Dict[str, Any], plan: SchemaPlan = PROPERTY_PLAN) -> Dict[str, Any]:
+    """Resolve each section once, then read and coerce every field from its section"""
+    sections, schema_fields = plan
+    nodes: List[Any] = [item]
+    for parent, key in sections:
+        node = nodes[parent]
+        nodes.append(node.get(key) if isinstance(node, dict) else None)
+    
+    fields: Dict[str, Any] = {}
+    for out_key, section, key, coerce, default in schema_fields:
+        node = nodes[section]
+        value = node.get(key) if isinstance(node, dict) else None
+        try:
+            fields[out_key] = coerce(default if value is None else value)
+        except (TypeError, ValueError):
+            fields[out_key] = coerce(default)
+    return fields
+
+def parse_property(item: Dict[str, Any]) -> Optional[PropertyRecord]:
+    """Parse a single property from the new API response structure"""
+    try:
+        g = item.get
+        
+        # Extract basic property info - using token as ID since it's more unique
+        fields = extract_fields(item)
+        pop = fields.pop
+        property_type, street, house_number, city = pop('property_type'), pop('street'), pop('house_number'), pop('city')
+        
+        # orderId is only looked up when there is no token
+        property_id = item['token'] if 'token' in item else g('orderId', '')
+        record = PropertyRecord(id=str(property_id), **fields)
+        
+        # Build address from street (with house number), neighborhood and city
+        if street and house_number:
+            street = f"{street} {house_number}"
+        record.address = ', '.join(filter(None, (street, record.neighborhood, city)))
+        
+        # Extract amenities from tags (only built when the listing has any)
+        tags = g('tags')
+        if tags:
+            record.amenities = [name for tag in tags if (name := tag.get('name'))]
+        
+        # Build title
+        room_text = f"{record.rooms} חדרים" if record.rooms > 0 else ""
+        location_text = record.neighborhood or 'חיפה'
+        
+        title = ' '.join(filter(None, (room_text, property_type, f"ב{location_text}" if location_text else "")))
+        record.title = title or f"נכס ב{location_text}"
+        
+        # Extract description from property type and first 3 amenities
+        description_type = property_type if property_type not in title else ""
+        record.description = ', '.join(filter(None, (description_type, *record.amenities[:3])))
+        
+        # Only return properties with essential data
+        if record.id and record.price > 0 and record.address:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"✨ Parsed: {record.title} - ₪{record.price:,}")
+            return record
+        else:
+            logger.debug("⚠️ Skipping property with missing data: ID=%s, Price=%s, Address=%s",
+                         record.id, record.price, record.address)
+            return None
+            
+    except Exception as e:
+        logger.error("❌ Error parsing property: %s", e)
+        return None